@@ -0,0 +1,247 @@
+# modules/backtest/engine.py
+#
+# Replays the report's signal rules (modules/reports/scoring.py) over every
+# stored bar and simulates trades: enter at the close of a bar whose signal is
+# in `entry_signals`, exit at the close `hold_bars` later or earlier on an
+# `exit_signals` bar. One position per symbol at a time, costs in basis points
+# per side. Symbols run in parallel in a process pool.
+#
+# from modules.backtest.engine import backtest_universe
+# per_symbol, aggregate = backtest_universe(["TCS", "INFY"], hold_bars=10, cost_bps=10)
+#
+# python -m modules.backtest.engine NIFTY50 --hold 10 --cost-bps 10 --download 10y
+
+import argparse
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from modules.data_fetcher.price_store import INTRADAY_SECONDS, read_prices, update_prices_many
+from modules.indicators.registry import compute_indicator_arrays, resolve_config
+from modules.reports.scoring import score_signals
+from modules.screener.screener import SIGNALS, resolve_universe
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+RESULTS_DIR = os.path.join(PROJECT_ROOT, "data", "backtests")
+
+DEFAULT_PARAMS = {
+    "entry_signals": ["strong_buy"],
+    "exit_signals": ["strong_sell"],
+    "hold_bars": 10,
+    "cost_bps": 10.0,
+}
+BARS_PER_YEAR = {"1d": 252, "1wk": 52, "1mo": 12}
+SESSION_SECONDS = 375 * 60
+
+
+def bars_per_year(interval: str = "1d") -> float:
+    if interval in INTRADAY_SECONDS:
+        return BARS_PER_YEAR["1d"] * SESSION_SECONDS / INTRADAY_SECONDS[interval]
+    return BARS_PER_YEAR.get(interval, 252)
+
+
+def signal_mask(signals: np.ndarray, names) -> np.ndarray:
+    labels = [SIGNALS[name.lower()] for name in names or []]
+    return np.isin(signals, labels)
+
+
+def simulate(close: np.ndarray, entry: np.ndarray, exit_: np.ndarray, hold_bars: int, cost_bps: float):
+    """
+    Trades and per-bar strategy returns for one symbol.
+    Returns (trades, returns, held): trades is an (n_trades, 2) array of (entry bar, exit bar),
+    returns holds the close-to-close return of every bar the position was open, net of costs.
+    """
+    close = np.asarray(close, dtype="float64")
+    n = len(close)
+    returns = np.zeros(n)
+    held = np.zeros(n, dtype=bool)
+    if n < 2:
+        return np.empty((0, 2), dtype=int), returns, held
+
+    # First exit-signal bar at or after each bar (n if none)
+    exit_at = np.where(exit_, np.arange(n), n)
+    next_exit = np.minimum.accumulate(exit_at[::-1])[::-1]
+
+    candidates = np.flatnonzero(entry[:-1])
+    exits = np.minimum(np.minimum(candidates + hold_bars, next_exit[candidates + 1]), n - 1)
+
+    # One position at a time: skip signals while a trade is open
+    trades = []
+    free_from = 0
+    for start, end in zip(candidates, exits):
+        if start >= free_from:
+            trades.append((start, end))
+            free_from = end + 1
+    trades = np.array(trades, dtype=int).reshape(-1, 2)
+
+    if len(trades):
+        steps = np.zeros(n + 1, dtype=int)
+        np.add.at(steps, trades[:, 0] + 1, 1)
+        np.add.at(steps, trades[:, 1] + 1, -1)
+        held = np.cumsum(steps[:n]) > 0
+
+        bar_returns = np.zeros(n)
+        bar_returns[1:] = close[1:] / close[:-1] - 1
+        returns = np.where(held, bar_returns, 0.0)
+        cost = cost_bps / 1e4
+        np.subtract.at(returns, trades[:, 0] + 1, cost)
+        np.subtract.at(returns, trades[:, 1], cost)
+    return trades, np.nan_to_num(returns), held
+
+
+def trade_returns(trades: np.ndarray, returns: np.ndarray) -> np.ndarray:
+    growth = np.concatenate([[0.0], np.cumsum(np.log1p(returns))])
+    return np.expm1(growth[trades[:, 1] + 1] - growth[trades[:, 0] + 1])
+
+
+def performance(returns: np.ndarray, periods_per_year: float) -> dict:
+    equity = np.cumprod(1 + returns)
+    years = len(returns) / periods_per_year
+    final = float(equity[-1]) if len(equity) else 1.0
+    drawdown = equity / np.maximum.accumulate(equity) - 1 if len(equity) else np.zeros(1)
+    return {
+        "total_return": final - 1,
+        "cagr": final ** (1 / years) - 1 if years > 0 and final > 0 else float("nan"),
+        "max_drawdown": float(drawdown.min()),
+        "years": years,
+    }
+
+
+def backtest_frame(prices: pd.DataFrame, config: dict = None, interval: str = "1d", **params) -> tuple:
+    """
+    Backtest one symbol's price frame (date/high/low/close). Returns (metrics dict, daily return Series).
+    `config` is the indicator config; `params` override DEFAULT_PARAMS.
+    """
+    p = {**DEFAULT_PARAMS, **params}
+    prices = prices.sort_values("date").reset_index(drop=True)
+    values = compute_indicator_arrays(prices["high"].to_numpy(), prices["low"].to_numpy(),
+                                      prices["close"].to_numpy(), config)
+    return evaluate_signals(prices, bar_signals(prices, values, config), interval, **p)
+
+
+def bar_signals(prices: pd.DataFrame, values: dict, config: dict = None) -> np.ndarray:
+    """Signal label per bar for indicator arrays computed with `config` (column names follow its periods)."""
+    c = resolve_config(config)
+    frame = pd.DataFrame(values).assign(close=prices["close"].to_numpy())
+    scored = score_signals(frame, rsi_col=f"rsi_{c['rsi_period']}", adx_col=f"adx_{c['adx_period']}",
+                           supertrend_col=f"supertrend_{c['supertrend_period']}_dir")
+    return scored["signal"].to_numpy()
+
+
+def evaluate_signals(prices: pd.DataFrame, signals: np.ndarray, interval: str = "1d", **params) -> tuple:
+    """Simulate trades for precomputed per-bar signal labels; see backtest_frame."""
+    p = {**DEFAULT_PARAMS, **params}
+    close = prices["close"].to_numpy(dtype="float64")
+    trades, returns, held = simulate(close, signal_mask(signals, p["entry_signals"]),
+                                     signal_mask(signals, p["exit_signals"]), p["hold_bars"], p["cost_bps"])
+    per_year = bars_per_year(interval)
+    perf = performance(returns, per_year)
+    per_trade = trade_returns(trades, returns) if len(trades) else np.empty(0)
+    metrics = {
+        "trades": len(trades),
+        "hit_rate": float((per_trade > 0).mean()) if len(per_trade) else float("nan"),
+        "avg_trade_return": float(per_trade.mean()) if len(per_trade) else float("nan"),
+        **perf,
+        "exposure": float(held.mean()) if len(held) else 0.0,
+        # Each round trip buys and sells the full position: traded value / capital per year
+        "turnover": 2 * len(trades) / perf["years"] if perf["years"] > 0 else float("nan"),
+        "bars": len(close),
+    }
+    return metrics, pd.Series(returns, index=pd.DatetimeIndex(prices["date"]), name="returns")
+
+
+def _run_symbol(task):
+    symbol, config, interval, params = task
+    prices = read_prices(symbol, interval)
+    if prices.empty or len(prices) < 2:
+        return symbol, None, None
+    metrics, returns = backtest_frame(prices, config, interval, **params)
+    return symbol, metrics, returns
+
+
+def _map(fn, tasks, workers):
+    if workers == 1:
+        yield from map(fn, tasks)
+        return
+    chunksize = max(1, math.ceil(len(tasks) / (workers * 4)))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(fn, tasks, chunksize=chunksize)
+
+
+def aggregate_results(per_symbol: pd.DataFrame, returns: dict, interval: str = "1d") -> dict:
+    """Equal-weight portfolio of all symbols (flat symbols earn 0) plus pooled trade statistics."""
+    if per_symbol.empty:
+        return {}
+    panel = pd.DataFrame(returns).sort_index().fillna(0.0)
+    portfolio = panel.mean(axis=1).to_numpy()
+    perf = performance(portfolio, bars_per_year(interval))
+    trades = per_symbol["trades"].sum()
+    hits = (per_symbol["hit_rate"].fillna(0) * per_symbol["trades"]).sum()
+    weighted = (per_symbol["avg_trade_return"].fillna(0) * per_symbol["trades"]).sum()
+    return {
+        "symbols": len(per_symbol),
+        "trades": int(trades),
+        "hit_rate": float(hits / trades) if trades else float("nan"),
+        "avg_trade_return": float(weighted / trades) if trades else float("nan"),
+        **perf,
+        "turnover": float(per_symbol["turnover"].mean()),
+    }
+
+
+def backtest_universe(symbols, config: dict = None, interval: str = "1d", workers: int = None, **params) -> tuple:
+    """
+    Backtest stored history for many symbols across a process pool.
+    Returns (per-symbol metrics DataFrame, aggregate metrics dict).
+    """
+    params = {**DEFAULT_PARAMS, **params}
+    tasks = [(symbol.upper(), config, interval, params) for symbol in symbols]
+    workers = workers or os.cpu_count() or 1
+
+    rows, returns = [], {}
+    for symbol, metrics, series in _map(_run_symbol, tasks, workers):
+        if metrics is None:
+            print(f"[backtest] {symbol}: no stored prices, skipped")
+            continue
+        rows.append({"symbol": symbol, **metrics})
+        returns[symbol] = series
+
+    per_symbol = pd.DataFrame(rows)
+    aggregate = aggregate_results(per_symbol, returns, interval)
+    print(f"[backtest] {len(per_symbol)} symbols, {aggregate.get('trades', 0)} trades")
+    return per_symbol, aggregate
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest the report's signal rules on stored prices")
+    parser.add_argument("universe", nargs="?", default="NIFTY50", help="index name, ALL or TCS,INFY")
+    parser.add_argument("--hold", type=int, default=DEFAULT_PARAMS["hold_bars"])
+    parser.add_argument("--cost-bps", type=float, default=DEFAULT_PARAMS["cost_bps"])
+    parser.add_argument("--entry", nargs="+", default=DEFAULT_PARAMS["entry_signals"], choices=sorted(SIGNALS))
+    parser.add_argument("--exit", nargs="*", default=DEFAULT_PARAMS["exit_signals"], choices=sorted(SIGNALS))
+    parser.add_argument("--interval", default="1d")
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--download", help="backfill the price store first, e.g. 10y")
+    args = parser.parse_args()
+
+    symbols = resolve_universe(args.universe, args.interval)
+    if args.download:
+        update_prices_many(symbols, period=args.download, interval=args.interval)
+
+    per_symbol, aggregate = backtest_universe(symbols, interval=args.interval, workers=args.workers,
+                                              hold_bars=args.hold, cost_bps=args.cost_bps,
+                                              entry_signals=args.entry, exit_signals=args.exit)
+    if per_symbol.empty:
+        return
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    out_path = os.path.join(RESULTS_DIR, f"backtest_{pd.Timestamp.now():%Y%m%d_%H%M%S}.csv")
+    per_symbol.sort_values("cagr", ascending=False).to_csv(out_path, index=False)
+    print(per_symbol.sort_values("cagr", ascending=False).head(20).to_string(index=False))
+    print("\n".join(f"{k:>18}: {v:.4f}" if isinstance(v, float) else f"{k:>18}: {v}" for k, v in aggregate.items()))
+    print(f"[backtest] Per-symbol results saved to {out_path}")
+
+
+if __name__ == "__main__":
+    main()
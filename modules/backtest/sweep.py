@@ -0,0 +1,162 @@
+# modules/backtest/sweep.py
+#
+# Grid / random search over indicator configs and backtest parameters.
+# Each worker process takes a chunk of symbols, builds one IndicatorContext per
+# symbol and evaluates every config against it, so intermediates shared across
+# the grid (true range, directional movement, ATR/RSI/ADX per window, EMA per
+# span, rolling mean/std per window, Supertrend per period and multiplier)
+# are computed once per symbol instead of once per config.
+#
+# from modules.backtest.sweep import sweep
+# ranked = sweep(["TCS", "INFY"], {"rsi_period": [10, 14], "supertrend_multiplier": [2, 3], "hold_bars": [5, 10]})
+#
+# python -m modules.backtest.sweep NIFTY50 --grid rsi_period=10,14,21 supertrend_period=7,10 hold_bars=5,10
+# python -m modules.backtest.sweep NIFTY50 --grid bb_std=1.5,2,2.5 macd_fast=8,12 --random 20
+
+import argparse
+import itertools
+import math
+import os
+import random
+
+import pandas as pd
+
+from modules.backtest.engine import DEFAULT_PARAMS, RESULTS_DIR, _map, bar_signals, evaluate_signals
+from modules.data_fetcher.price_store import read_prices
+from modules.indicators.registry import DEFAULT_CONFIG, IndicatorContext, compute_indicator_arrays
+from modules.screener.screener import resolve_universe
+
+RANK_METRICS = ["cagr", "hit_rate", "avg_trade_return", "max_drawdown", "total_return"]
+
+
+def expand_grid(grid: dict, samples: int = None, seed: int = 0) -> list:
+    """Every combination of the grid's values, or `samples` of them drawn at random."""
+    keys = sorted(grid)
+    combos = [dict(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+    if samples is not None and samples < len(combos):
+        combos = random.Random(seed).sample(combos, samples)
+    return combos
+
+
+def split_combo(combo: dict):
+    """(indicator config, backtest params) from one grid point."""
+    unknown = set(combo) - set(DEFAULT_CONFIG) - set(DEFAULT_PARAMS)
+    if unknown:
+        raise ValueError(f"Unknown sweep keys: {sorted(unknown)}")
+    config = {k: v for k, v in combo.items() if k in DEFAULT_CONFIG}
+    params = {k: v for k, v in combo.items() if k in DEFAULT_PARAMS}
+    return config, params
+
+
+def _sweep_symbols(task):
+    symbols, combos, interval, base_params = task
+    rows = []
+    for symbol in symbols:
+        prices = read_prices(symbol, interval)
+        if len(prices) < 2:
+            continue
+        prices = prices.sort_values("date").reset_index(drop=True)
+        ctx = IndicatorContext(prices["high"], prices["low"], prices["close"])
+        signals_by_config = {}
+        for i, combo in enumerate(combos):
+            config, params = split_combo(combo)
+            # Configs that differ only in backtest params share the scored signals too
+            key = tuple(sorted(config.items()))
+            if key not in signals_by_config:
+                values = compute_indicator_arrays(None, None, None, config, context=ctx)
+                signals_by_config[key] = bar_signals(prices, values, config)
+            metrics, _ = evaluate_signals(prices, signals_by_config[key], interval, **{**base_params, **params})
+            rows.append({"combo": i, "symbol": symbol, **metrics})
+    return rows
+
+
+def summarize(per_symbol: pd.DataFrame, combos: list, rank_by: str = "cagr") -> pd.DataFrame:
+    """One row per grid point: parameters plus metrics averaged over symbols (hit rate pooled over trades)."""
+    per_symbol = per_symbol.assign(
+        hits=per_symbol["hit_rate"].fillna(0) * per_symbol["trades"],
+        trade_return_sum=per_symbol["avg_trade_return"].fillna(0) * per_symbol["trades"],
+    )
+    grouped = per_symbol.groupby("combo")
+    table = pd.DataFrame({
+        "symbols": grouped["symbol"].count(),
+        "trades": grouped["trades"].sum(),
+        "cagr": grouped["cagr"].mean(),
+        "median_cagr": grouped["cagr"].median(),
+        "total_return": grouped["total_return"].mean(),
+        "max_drawdown": grouped["max_drawdown"].mean(),
+        "exposure": grouped["exposure"].mean(),
+        "turnover": grouped["turnover"].mean(),
+    })
+    trades = table["trades"].where(table["trades"] > 0)
+    table["hit_rate"] = grouped["hits"].sum() / trades
+    table["avg_trade_return"] = grouped["trade_return_sum"].sum() / trades
+
+    params = pd.DataFrame(combos)
+    table = params.join(table, how="inner")
+    # Drawdowns are negative, so larger is better for every rank metric
+    return table.sort_values(rank_by, ascending=False, na_position="last").reset_index(drop=True)
+
+
+def sweep(symbols, grid: dict, samples: int = None, interval: str = "1d", workers: int = None,
+          rank_by: str = "cagr", seed: int = 0, **base_params) -> pd.DataFrame:
+    """Backtest every grid point on every symbol; returns the ranked summary table."""
+    if rank_by not in RANK_METRICS:
+        raise ValueError(f"rank_by must be one of {RANK_METRICS}")
+    combos = expand_grid(grid, samples, seed)
+    for combo in combos:
+        split_combo(combo)
+
+    symbols = [s.upper() for s in symbols]
+    workers = workers or os.cpu_count() or 1
+    per_task = max(1, math.ceil(len(symbols) / (workers * 4)))
+    tasks = [(symbols[i:i + per_task], combos, interval, base_params) for i in range(0, len(symbols), per_task)]
+
+    print(f"[sweep] {len(combos)} configs x {len(symbols)} symbols on {workers} workers")
+    rows = [row for chunk in _map(_sweep_symbols, tasks, workers) for row in chunk]
+    if not rows:
+        print("[sweep] No stored prices for the requested symbols")
+        return pd.DataFrame()
+    return summarize(pd.DataFrame(rows), combos, rank_by)
+
+
+def _parse_grid(items) -> dict:
+    """["rsi_period=10,14", "bb_std=1.5,2"] -> {"rsi_period": [10, 14], "bb_std": [1.5, 2.0]}"""
+    grid = {}
+    for item in items:
+        key, _, values = item.partition("=")
+        parsed = []
+        for value in values.split(","):
+            value = value.strip()
+            if value.lower() in ("true", "false"):
+                parsed.append(value.lower() == "true")
+            else:
+                number = float(value)
+                parsed.append(int(number) if number.is_integer() and "." not in value else number)
+        grid[key.strip()] = parsed
+    return grid
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rank indicator configs by backtest metrics")
+    parser.add_argument("universe", nargs="?", default="NIFTY50", help="index name, ALL or TCS,INFY")
+    parser.add_argument("--grid", nargs="+", required=True, help="key=v1,v2,... (indicator config or backtest params)")
+    parser.add_argument("--random", type=int, help="evaluate this many random grid points instead of all")
+    parser.add_argument("--rank-by", default="cagr", choices=RANK_METRICS)
+    parser.add_argument("--interval", default="1d")
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    symbols = resolve_universe(args.universe, args.interval)
+    ranked = sweep(symbols, _parse_grid(args.grid), args.random, args.interval, args.workers, args.rank_by, args.seed)
+    if ranked.empty:
+        return
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    out_path = os.path.join(RESULTS_DIR, f"sweep_{pd.Timestamp.now():%Y%m%d_%H%M%S}.csv")
+    ranked.to_csv(out_path, index=False)
+    print(ranked.head(20).to_string(index=False))
+    print(f"[sweep] Ranked table saved to {out_path}")
+
+
+if __name__ == "__main__":
+    main()
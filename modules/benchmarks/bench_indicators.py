@@ -0,0 +1,255 @@
+# modules/benchmarks/bench_indicators.py
+#
+# Offline indicator benchmarks on deterministic synthetic OHLCV.
+# Times every indicator implementation (indicators.py, apply_indicators.py,
+# ta_calculations.py, the registry per column and the universe path), reports
+# bars/s and peak traced memory, checks every implementation against the ta
+# library itself, and writes the results to data/benchmarks/ as JSON.
+#
+# python -m modules.benchmarks.bench_indicators                     # small sizes
+# python -m modules.benchmarks.bench_indicators --sizes large
+# python -m modules.benchmarks.bench_indicators --compare data/benchmarks/indicators_<old>.json
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import ta
+
+from modules.indicators import apply_indicators, indicators, ta_calculations
+from modules.indicators.registry import available_columns, compute_indicator_arrays
+from modules.indicators.universe import build_panel, compute_panel_indicators
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+RESULTS_DIR = os.path.join(PROJECT_ROOT, "data", "benchmarks")
+
+# (symbols, bars per symbol)
+SIZES = {
+    "small": [(1, 200), (1, 5000), (50, 1000)],
+    "medium": [(1, 200), (1, 5000), (100, 2500), (500, 2500)],
+    "large": [(1, 200), (1, 5000), (500, 2500), (2000, 5000)],
+}
+# Per-symbol pandas implementations run on at most this many symbols; throughput is per bar anyway
+MAX_LOOP_SYMBOLS = 50
+AGREEMENT_RTOL = 1e-9
+AGREEMENT_ATOL = 1e-9
+
+
+def synthetic_ohlcv(n_symbols: int = 1, n_bars: int = 500, seed: int = 42) -> pd.DataFrame:
+    """
+    Long OHLCV frame (date/symbol/open/high/low/close/volume) from a seeded geometric random walk.
+    The same arguments always give the same prices.
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2000-01-03", periods=n_bars)
+    start = rng.uniform(50, 3000, size=(n_symbols, 1))
+    returns = rng.normal(0.0003, 0.018, size=(n_symbols, n_bars))
+    close = start * np.exp(np.cumsum(returns, axis=1))
+    open_ = close * np.exp(rng.normal(0, 0.004, size=close.shape))
+    spread = np.abs(rng.normal(0, 0.01, size=close.shape)) * close
+    high = np.maximum(open_, close) + spread * rng.uniform(0, 1, size=close.shape)
+    low = np.minimum(open_, close) - spread * rng.uniform(0, 1, size=close.shape)
+    volume = rng.integers(10_000, 5_000_000, size=close.shape).astype("float64")
+
+    return pd.DataFrame({
+        "date": np.tile(dates, n_symbols),
+        "symbol": np.repeat([f"SYN{i:04d}" for i in range(n_symbols)], n_bars),
+        "open": open_.ravel(), "high": high.ravel(), "low": low.ravel(),
+        "close": close.ravel(), "volume": volume.ravel(),
+    })
+
+
+def _quiet(fn, *args, **kwargs):
+    # The indicator modules print debug output on every call
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args, **kwargs)
+
+
+def _per_symbol(frames, fn):
+    return lambda: [_quiet(fn, df.copy()) for df in frames]
+
+
+def _capitalized(df):
+    return df.rename(columns={"open": "Open", "high": "High", "low": "Low", "close": "Close", "volume": "Volume"})
+
+
+def _cases(prices: pd.DataFrame, n_bars: int):
+    """(name, callable, bars processed) for one size."""
+    frames = [df.reset_index(drop=True) for _, df in prices.groupby("symbol", sort=False)][:MAX_LOOP_SYMBOLS]
+    loop_bars = len(frames) * n_bars
+    caps = [_capitalized(df) for df in frames]
+    cases = [
+        ("indicators.apply_all_indicators", _per_symbol(frames, indicators.apply_all_indicators), loop_bars),
+        ("apply_indicators.apply_all_indicators", _per_symbol(caps, apply_indicators.apply_all_indicators), loop_bars),
+        ("ta_calculations.apply_all_indicators", _per_symbol(frames, ta_calculations.apply_all_indicators), loop_bars),
+    ]
+
+    first = frames[0]
+    high, low, close = (first[c].to_numpy() for c in ("high", "low", "close"))
+    for column in available_columns():
+        cases.append((f"registry[{column}]",
+                      lambda column=column: compute_indicator_arrays(high, low, close, columns=[column]), n_bars))
+
+    panel = build_panel(prices)
+    cases.append(("universe.compute_panel_indicators", lambda: compute_panel_indicators(panel), len(prices)))
+    return cases
+
+
+def _time(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _peak_memory(fn) -> float:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 1e6
+    finally:
+        tracemalloc.stop()
+
+
+def ta_reference(df: pd.DataFrame) -> pd.DataFrame:
+    """The default-config columns straight from the ta library, which every implementation reproduces."""
+    high, low, close = df["high"], df["low"], df["close"]
+    macd = ta.trend.MACD(close=close, window_slow=26, window_fast=12, window_sign=9)
+    bb = ta.volatility.BollingerBands(close=close, window=20, window_dev=2)
+    return pd.DataFrame({
+        "rsi_14": ta.momentum.RSIIndicator(close=close, window=14).rsi(),
+        "macd": macd.macd(),
+        "macd_signal": macd.macd_signal(),
+        "bb_upper": bb.bollinger_hband(),
+        "bb_lower": bb.bollinger_lband(),
+        "atr_14": ta.volatility.AverageTrueRange(high=high, low=low, close=close, window=14).average_true_range(),
+        "adx_14": ta.trend.ADXIndicator(high=high, low=low, close=close, window=14).adx(),
+    })
+
+
+def check_agreement(n_bars: int = 1000, seed: int = 7) -> list:
+    """
+    Max abs difference of every implementation against ta_reference. ta has no Supertrend,
+    and every implementation takes it from kernels.supertrend, so it is not compared here.
+    """
+    df = synthetic_ohlcv(1, n_bars, seed)
+    reference = ta_reference(df)
+    others = {
+        "indicators": _quiet(indicators.apply_all_indicators, df.copy()),
+        "apply_indicators": _quiet(apply_indicators.apply_all_indicators, _capitalized(df)).rename(
+            columns={"adx": "adx_14"}),
+        "ta_calculations": _quiet(ta_calculations.apply_all_indicators, df.copy()).rename(columns={"adx": "adx_14"}),
+        "registry": pd.DataFrame(compute_indicator_arrays(df["high"], df["low"], df["close"])),
+        "universe": pd.DataFrame({name: values[0] for name, values in
+                                  compute_panel_indicators(build_panel(df)).items()}),
+    }
+
+    rows = []
+    for name, other in others.items():
+        for column in reference.columns:
+            if column not in other.columns:
+                continue
+            a = reference[column].to_numpy(dtype="float64")
+            b = other[column].to_numpy(dtype="float64")
+            both = ~(np.isnan(a) | np.isnan(b))
+            rows.append({
+                "implementation": name,
+                "column": column,
+                "max_abs_diff": float(np.max(np.abs(a[both] - b[both]))) if both.any() else 0.0,
+                "nan_mismatch": int(np.sum(np.isnan(a) != np.isnan(b))),
+                "agrees": bool(np.allclose(a, b, rtol=AGREEMENT_RTOL, atol=AGREEMENT_ATOL, equal_nan=True)),
+            })
+    return rows
+
+
+def run(size_name: str = "small", repeat: int = 3, seed: int = 42) -> dict:
+    results = []
+    for n_symbols, n_bars in SIZES[size_name]:
+        prices = synthetic_ohlcv(n_symbols, n_bars, seed)
+        for name, fn, bars in _cases(prices, n_bars):
+            seconds = _time(fn, repeat)
+            peak_mb = _peak_memory(fn)
+            results.append({
+                "symbols": n_symbols, "bars": n_bars, "case": name,
+                "seconds": round(seconds, 6),
+                "bars_per_sec": round(bars / seconds) if seconds else None,
+                "peak_mb": round(peak_mb, 3),
+            })
+            print(f"[bench] {n_symbols:>5} x {n_bars:<5} {name:<42} {seconds * 1000:10.2f} ms "
+                  f"{bars / seconds if seconds else 0:14,.0f} bars/s {peak_mb:9.2f} MB")
+
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "sizes": size_name,
+        "repeat": repeat,
+        "results": results,
+        "agreement": check_agreement(),
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def save_results(report: dict, path: str = None) -> str:
+    if path is None:
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        path = os.path.join(RESULTS_DIR, f"indicators_{stamp}_{report.get('commit') or 'nocommit'}.json")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+    return path
+
+
+def compare(report: dict, baseline_path: str):
+    """Print the speed ratio of each case against an earlier results file (>1 means faster now)."""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    before = {(r["symbols"], r["bars"], r["case"]): r["seconds"] for r in baseline["results"]}
+    print(f"[bench] Compared with {baseline.get('commit')} ({baseline.get('timestamp')}):")
+    for r in report["results"]:
+        old = before.get((r["symbols"], r["bars"], r["case"]))
+        if old and r["seconds"]:
+            print(f"  {r['symbols']:>5} x {r['bars']:<5} {r['case']:<42} {old / r['seconds']:6.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark indicator implementations on synthetic OHLCV")
+    parser.add_argument("--sizes", choices=sorted(SIZES), default="small")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="results JSON path (default: data/benchmarks/indicators_<time>_<commit>.json)")
+    parser.add_argument("--compare", help="earlier results JSON to compare against")
+    args = parser.parse_args()
+
+    report = run(args.sizes, args.repeat, args.seed)
+    for row in report["agreement"]:
+        status = "✅" if row["agrees"] else "❌"
+        print(f"[bench] {status} {row['implementation']:<17} {row['column']:<18} "
+              f"max diff {row['max_abs_diff']:.3e}, NaN mismatches {row['nan_mismatch']}")
+    print(f"[bench] Results saved to {save_results(report, args.output)}")
+    if args.compare:
+        compare(report, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,56 @@
 # modules/data_classifier/classify_market_cap.py
 
 import pandas as pd
-from nsepython import nse_eq
 import os
-import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-def classify_market_caps(input_path="data/raw/nifty500_companies.csv", output_path="data/processed/classified_market_caps.csv"):
+from modules.data_fetcher.nse_client import get_nse_client
+from modules.utils.helpers import atomic_write_csv
+
+OUTPUT_COLUMNS = ["symbol", "company_name", "isin", "industry", "market_cap", "cap_category"]
+
+
+def classify_cap(market_cap):
+    # Market cap classification (adjust thresholds as needed)
+    if market_cap >= 200000:  # in crores (e.g., ₹2 lakh Cr)
+        return "Large Cap"
+    elif market_cap >= 50000:
+        return "Mid Cap"
+    return "Small Cap"
+
+
+def _classify_row(row, client):
+    """Returns (record, ok). ok is False when NSE could not be reached, so a resume retries it."""
+    symbol = row["symbol"]
+    ok = True
+    try:
+        eq_data = client.quote_equity(symbol)
+        market_cap_str = eq_data["info"].get("marketCap", "0").replace(",", "")
+        market_cap = float(market_cap_str)
+    except Exception as e:
+        print(f"[{symbol}] Error fetching data: {e}")
+        market_cap = 0.0
+        ok = False
+
+    return {
+        "symbol": symbol,
+        "company_name": row.get("company_name", ""),
+        "isin": row.get("isin", ""),
+        "industry": row.get("industry", ""),
+        "market_cap": market_cap,
+        "cap_category": classify_cap(market_cap)
+    }, ok
+
+
+def classify_market_caps(input_path="data/raw/nifty500_companies.csv", output_path="data/processed/classified_market_caps.csv",
+                         workers=8, checkpoint_every=25, resume=True):
+    """
+    Classify every symbol in input_path by market cap.
+    Symbols are fetched by a pool of `workers` threads; the shared NSE client keeps the
+    global request rate in check. Completed symbols are checkpointed every
+    `checkpoint_every` results to <output>.checkpoint.csv, and with resume=True a rerun
+    skips symbols already in the checkpoint.
+    """
     if not os.path.exists(input_path):
         raise FileNotFoundError(f"Input file not found: {input_path}")
 
@@ -13,41 +58,48 @@ def classify_market_caps(input_path="data/raw/nifty500_companies.csv", output_pa
     if df.empty:
         raise ValueError("Input CSV is empty.")
 
-    classified_data = []
-
-    for idx, row in df.iterrows():
-        symbol = row["symbol"]
-        try:
-            eq_data = nse_eq(symbol)
-            market_cap_str = eq_data["info"].get("marketCap", "0").replace(",", "")
-            market_cap = float(market_cap_str)
-        except Exception as e:
-            print(f"[{symbol}] Error fetching data: {e}")
-            market_cap = 0.0
-
-        # Market cap classification (adjust thresholds as needed)
-        if market_cap >= 200000:  # in crores (e.g., ₹2 lakh Cr)
-            cap_type = "Large Cap"
-        elif market_cap >= 50000:
-            cap_type = "Mid Cap"
-        else:
-            cap_type = "Small Cap"
-
-        classified_data.append({
-            "symbol": symbol,
-            "company_name": row.get("company_name", ""),
-            "isin": row.get("isin", ""),
-            "industry": row.get("industry", ""),
-            "market_cap": market_cap,
-            "cap_category": cap_type
-        })
-
-        # Be polite to NSE servers
-        time.sleep(0.6)
-
-    output_df = pd.DataFrame(classified_data)
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    output_df.to_csv(output_path, index=False)
+    checkpoint_path = output_path + ".checkpoint.csv"
+    done = {}
+    if resume and os.path.exists(checkpoint_path):
+        for record in pd.read_csv(checkpoint_path).to_dict("records"):
+            done[record["symbol"]] = record
+        print(f"Resuming: {len(done)} symbols already classified")
+
+    pending = [row for _, row in df.iterrows() if row["symbol"] not in done]
+    failed = {}
+    client = get_nse_client()
+
+    def write_checkpoint():
+        atomic_write_csv(pd.DataFrame(list(done.values()), columns=OUTPUT_COLUMNS), checkpoint_path)
+
+    pool = ThreadPoolExecutor(max_workers=workers)
+    try:
+        futures = [pool.submit(_classify_row, row, client) for row in pending]
+        for count, future in enumerate(as_completed(futures), start=1):
+            record, ok = future.result()
+            if ok:
+                done[record["symbol"]] = record
+            else:
+                failed[record["symbol"]] = record
+            if count % checkpoint_every == 0:
+                write_checkpoint()
+                print(f"Checkpoint: {len(done)}/{len(df)} classified")
+        pool.shutdown(wait=True)
+    except BaseException:
+        # Ctrl-C or an error: drop queued symbols instead of fetching them, keep what is done
+        pool.shutdown(wait=False, cancel_futures=True)
+        raise
+    finally:
+        write_checkpoint()
+
+    # Keep input order; failed symbols are reported with market cap 0 as before
+    classified_data = [done.get(symbol) or failed[symbol] for symbol in df["symbol"]]
+    output_df = pd.DataFrame(classified_data, columns=OUTPUT_COLUMNS)
+    atomic_write_csv(output_df, output_path)
+    if not failed:
+        os.remove(checkpoint_path)
+    else:
+        print(f"⚠️ {len(failed)} symbols failed; rerun to retry them: {sorted(failed)}")
     print(f"✅ Classified market caps saved to {output_path}")
     return output_df
 
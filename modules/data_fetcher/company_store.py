@@ -0,0 +1,139 @@
+# modules/data_fetcher/company_store.py
+#
+# Company info keyed by symbol in SQLite (data/processed/company_info.db).
+# Rows are upserted one at a time by the bot or in bulk by universe runs, and
+# read back by primary-key lookup instead of parsing a whole CSV.
+#
+# from modules.data_fetcher.company_store import upsert_company_info, get_company_info
+# upsert_company_info(fetch_company_info("TCS"))
+# info = get_company_info("TCS")
+
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+DB_PATH = os.path.join(PROJECT_ROOT, "data", "processed", "company_info.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS company_info (
+    symbol        TEXT PRIMARY KEY,
+    company_name  TEXT,
+    sector        TEXT,
+    industry      TEXT,
+    market_cap    REAL,
+    current_price REAL,
+    updated_at    REAL NOT NULL,
+    data          TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_company_info_sector ON company_info (sector);
+"""
+
+UPSERT_SQL = """
+INSERT INTO company_info (symbol, company_name, sector, industry, market_cap, current_price, updated_at, data)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(symbol) DO UPDATE SET
+    company_name = excluded.company_name,
+    sector = excluded.sector,
+    industry = excluded.industry,
+    market_cap = excluded.market_cap,
+    current_price = excluded.current_price,
+    updated_at = excluded.updated_at,
+    data = excluded.data
+"""
+
+_local = threading.local()
+
+
+def _connect(db_path: str = None) -> sqlite3.Connection:
+    """One connection per thread and database; WAL lets readers run while the bot writes."""
+    db_path = db_path or DB_PATH
+    connections = getattr(_local, "connections", None)
+    if connections is None:
+        connections = _local.connections = {}
+    if db_path not in connections:
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        conn = sqlite3.connect(db_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+        connections[db_path] = conn
+    return connections[db_path]
+
+
+def _number(value):
+    try:
+        value = float(value)
+        return None if math.isnan(value) else value
+    except (TypeError, ValueError):
+        return None
+
+
+def _clean(value):
+    # NaN is not valid JSON; store it as null
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def _to_params(row: dict, now: float) -> tuple:
+    symbol = str(row["symbol"]).upper()
+    data = {k: _clean(v) for k, v in row.items()}
+    data["symbol"] = symbol
+    return (
+        symbol,
+        row.get("companyName"),
+        row.get("sector"),
+        row.get("industry"),
+        _number(row.get("marketCap")),
+        _number(row.get("currentPrice")),
+        now,
+        json.dumps(data, default=str),
+    )
+
+
+def upsert_company_info(row: dict, db_path: str = None):
+    """Insert or replace the info for one symbol."""
+    upsert_many([row], db_path=db_path)
+
+
+def upsert_many(rows, db_path: str = None) -> int:
+    """Upsert many rows in a single transaction. Returns the number of rows written."""
+    now = time.time()
+    params = [_to_params(row, now) for row in rows if row and row.get("symbol")]
+    if not params:
+        return 0
+    conn = _connect(db_path)
+    with conn:
+        conn.executemany(UPSERT_SQL, params)
+    return len(params)
+
+
+def get_company_info(symbol: str, db_path: str = None):
+    """Stored info dict for a symbol (with an `updatedAt` timestamp), or None."""
+    cur = _connect(db_path).execute(
+        "SELECT data, updated_at FROM company_info WHERE symbol = ?", (symbol.upper(),)
+    )
+    found = cur.fetchone()
+    if found is None:
+        return None
+    data = json.loads(found[0])
+    data["updatedAt"] = found[1]
+    return data
+
+
+def load_company_info(symbols=None, db_path: str = None) -> pd.DataFrame:
+    """All stored rows (or just `symbols`) as a DataFrame with the full info columns."""
+    conn = _connect(db_path)
+    if symbols is None:
+        cur = conn.execute("SELECT data, updated_at FROM company_info")
+    else:
+        symbols = [s.upper() for s in symbols]
+        placeholders = ",".join("?" * len(symbols))
+        cur = conn.execute(f"SELECT data, updated_at FROM company_info WHERE symbol IN ({placeholders})", symbols)
+    rows = [{**json.loads(data), "updatedAt": updated_at} for data, updated_at in cur.fetchall()]
+    return pd.DataFrame(rows)
@@ -1,17 +1,23 @@
 # modules/data_fetcher/fetch_company_info.py
 
 import os
-import pandas as pd
+import threading
 import yfinance as yf
 from datetime import datetime
 
+from modules.data_fetcher import company_store, fundamentals_cache
+from modules.data_fetcher.company_store import upsert_many
+
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 OUTPUT_DIR = os.path.join(PROJECT_ROOT, "data", "processed")
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
 
+_revalidating = set()
+_revalidating_lock = threading.Lock()
+
 
-def fetch_company_info(symbol):
+def _fetch_company_info_remote(symbol):
     info = {}
     try:
         ticker = yf.Ticker(symbol + ".NS")
@@ -58,19 +64,80 @@ def fetch_company_info(symbol):
         return None
 
 
-def save_company_info(symbols):
+def _fetch_current_price(symbol):
+    """Cheap price-only refresh through fast_info."""
+    try:
+        return yf.Ticker(symbol + ".NS").fast_info.get("lastPrice")
+    except Exception as e:
+        print(f"Error fetching price for {symbol}: {e}")
+        return None
+
+
+def _refresh(symbol, entry, stale):
+    """Re-fetch the stale fields of a cached entry. Falls back to the cached values on failure."""
+    if entry is not None and stale <= fundamentals_cache.PRICE_FIELDS:
+        price = _fetch_current_price(symbol)
+        if price is not None:
+            entry = fundamentals_cache.store(symbol, {"currentPrice": price})
+        return dict(entry["fields"])
+
+    data = _fetch_company_info_remote(symbol)
+    if data:
+        fundamentals_cache.store(symbol, data)
+        return data
+    return dict(entry["fields"]) if entry else None
+
+
+def _revalidate_in_background(symbol, entry, stale):
+    with _revalidating_lock:
+        if symbol in _revalidating:
+            return
+        _revalidating.add(symbol)
+
+    def run():
+        try:
+            _refresh(symbol, entry, stale)
+        finally:
+            with _revalidating_lock:
+                _revalidating.discard(symbol)
+
+    threading.Thread(target=run, name=f"revalidate-{symbol}", daemon=True).start()
+
+
+def fetch_company_info(symbol, use_cache=True, stale_while_revalidate=False):
+    """
+    Company fundamentals for a symbol, served from the per-field TTL cache when possible.
+    With stale_while_revalidate=True a stale entry is returned immediately and refreshed
+    in a background thread.
+    """
+    symbol = symbol.upper()
+    if not use_cache:
+        return _refresh(symbol, None, set())
+
+    entry = fundamentals_cache.load(symbol)
+    if entry is None:
+        return _refresh(symbol, None, set())
+
+    stale = fundamentals_cache.stale_fields(entry)
+    if not stale:
+        return dict(entry["fields"])
+    if stale_while_revalidate:
+        _revalidate_in_background(symbol, entry, stale)
+        return dict(entry["fields"])
+    return _refresh(symbol, entry, stale)
+
+
+def save_company_info(symbols, stale_while_revalidate=False):
     rows = []
     for symbol in symbols:
         print(f"Fetching: {symbol}")
-        data = fetch_company_info(symbol)
+        data = fetch_company_info(symbol, stale_while_revalidate=stale_while_revalidate)
         if data:
             rows.append(data)
 
     if rows:
-        df = pd.DataFrame(rows)
-        output_path = os.path.join(OUTPUT_DIR, "company_info.csv")
-        df.to_csv(output_path, index=False)
-        print(f"\nSaved to CSV at: {output_path}")
+        count = upsert_many(rows)
+        print(f"\nUpserted {count} rows into: {company_store.DB_PATH}")
     else:
         print("No data to save.")
 
@@ -4,7 +4,71 @@ import pandas as pd
 from datetime import datetime
 print(f"[DEBUG] Using fetch_price_data from: {__file__}")
 
-def fetch_price_data(symbol: str, period: str = "9mo", interval: str = "1d") -> pd.DataFrame:
+PRICE_COLUMNS = ["date", "symbol", "open", "high", "low", "close", "volume"]
+MIN_ROWS = 30  # Fewer rows than this is treated as a bad download and falls back to NSE
+
+
+def _normalize_yf_frame(df: pd.DataFrame, symbol: str) -> pd.DataFrame:
+    """Map a raw yfinance frame for one ticker onto PRICE_COLUMNS."""
+    df = df.copy()
+
+    # Normalize column names
+    if isinstance(df.columns, pd.MultiIndex):
+        df.columns = ['_'.join(col).strip().lower() for col in df.columns]
+    else:
+        df.columns = [str(col).strip().lower() for col in df.columns]
+
+    df.reset_index(inplace=True)
+
+    # Rename known variants to standard
+    rename_map = {}
+    for col in df.columns:
+        if "open" in col and "open" not in rename_map:
+            rename_map[col] = "open"
+        elif "high" in col and "high" not in rename_map:
+            rename_map[col] = "high"
+        elif "low" in col and "low" not in rename_map:
+            rename_map[col] = "low"
+        elif "close" in col and "close" not in rename_map:
+            rename_map[col] = "close"
+        elif "volume" in col and "volume" not in rename_map:
+            rename_map[col] = "volume"
+        elif "date" in col.lower() and "date" not in rename_map:
+            rename_map[col] = "date"
+
+    df.rename(columns=rename_map, inplace=True)
+
+    # Final validation
+    expected_cols = ["date", "open", "high", "low", "close", "volume"]
+    if not all(col in df.columns for col in expected_cols):
+        raise ValueError(f"[fetch_price_data] Missing expected columns: {expected_cols}. Found: {df.columns.tolist()}")
+
+    df["symbol"] = symbol
+    return df[PRICE_COLUMNS]
+
+
+def _fetch_from_nse(symbol: str, start=None) -> pd.DataFrame:
+    raw_data = nse_eq(symbol)
+    historical = raw_data["priceInfo"]["historical"]
+    df = pd.DataFrame(historical)
+
+    df["date"] = pd.to_datetime(df["date"])
+    df.rename(columns={
+        "open": "open",
+        "dayHigh": "high",
+        "dayLow": "low",
+        "close": "close",
+        "totalTradedVolume": "volume"
+    }, inplace=True)
+    df["symbol"] = symbol
+    df = df[PRICE_COLUMNS]
+    if start is not None:
+        df = df[df["date"] >= pd.Timestamp(start)]
+    return df.sort_values("date")
+
+
+def fetch_price_data(symbol: str, period: str = "9mo", interval: str = "1d", start=None) -> pd.DataFrame:
+    """Fetch OHLCV for one symbol. When `start` is given it takes precedence over `period`."""
     print(f"[DEBUG] Using fetch_price_data from: {__file__}")
     print(f"[fetch_price_data] Trying yfinance for {symbol}...")
     print(f"[DEBUG] Symbol type: {type(symbol)}, value: {symbol}")
@@ -12,46 +76,18 @@ def fetch_price_data(symbol: str, period: str = "9mo", interval: str = "1d") ->
     df = pd.DataFrame()  # Initialize here to avoid "df not defined" errors
 
     try:
-        df = yf.download(symbol + ".NS", period=period, interval=interval, progress=False)
+        if start is not None:
+            df = yf.download(symbol + ".NS", start=start, interval=interval, progress=False)
+        else:
+            df = yf.download(symbol + ".NS", period=period, interval=interval, progress=False)
 
         if df.empty:
             raise ValueError("YFinance returned empty DataFrame")
 
-        # Normalize column names
-        if isinstance(df.columns, pd.MultiIndex):
-            df.columns = ['_'.join(col).strip().lower() for col in df.columns]
-        else:
-            df.columns = [str(col).strip().lower() for col in df.columns]
-
-        df.reset_index(inplace=True)
-
-        # Rename known variants to standard
-        rename_map = {}
-        for col in df.columns:
-            if "open" in col and "open" not in rename_map:
-                rename_map[col] = "open"
-            elif "high" in col and "high" not in rename_map:
-                rename_map[col] = "high"
-            elif "low" in col and "low" not in rename_map:
-                rename_map[col] = "low"
-            elif "close" in col and "close" not in rename_map:
-                rename_map[col] = "close"
-            elif "volume" in col and "volume" not in rename_map:
-                rename_map[col] = "volume"
-            elif "date" in col.lower() and "date" not in rename_map:
-                rename_map[col] = "date"
-
-        df.rename(columns=rename_map, inplace=True)
-
-        # Final validation
-        expected_cols = ["date", "open", "high", "low", "close", "volume"]
-        if not all(col in df.columns for col in expected_cols):
-            raise ValueError(f"[fetch_price_data] Missing expected columns: {expected_cols}. Found: {df.columns.tolist()}")
-
-        df["symbol"] = symbol
-        df = df[["date", "symbol", "open", "high", "low", "close", "volume"]]
-
-        if len(df) >= 30:
+        df = _normalize_yf_frame(df, symbol)
+
+        # A gap fetch only returns the missing bars, so it can't be judged by MIN_ROWS
+        if len(df) >= MIN_ROWS or start is not None:
             print(f"[fetch_price_data] ✅ YFinance OK: {symbol}, rows: {len(df)}")
             return df
         else:
@@ -63,22 +99,7 @@ def fetch_price_data(symbol: str, period: str = "9mo", interval: str = "1d") ->
     # === Fallback to NSE Python ===
     try:
         print(f"[fetch_price_data] 🔁 Trying fallback with nsepython for {symbol}")
-        raw_data = nse_eq(symbol)
-        historical = raw_data["priceInfo"]["historical"]
-        df = pd.DataFrame(historical)
-
-        df["date"] = pd.to_datetime(df["date"])
-        df.rename(columns={
-            "open": "open",
-            "dayHigh": "high",
-            "dayLow": "low",
-            "close": "close",
-            "totalTradedVolume": "volume"
-        }, inplace=True)
-        df["symbol"] = symbol
-        df = df[["date", "symbol", "open", "high", "low", "close", "volume"]]
-        df = df.sort_values("date")
-
+        df = _fetch_from_nse(symbol, start=start)
         print(f"[fetch_price_data] ✅ Fallback NSE OK: {symbol}, rows: {len(df)}")
         return df
     except Exception as e:
@@ -87,4 +108,79 @@ def fetch_price_data(symbol: str, period: str = "9mo", interval: str = "1d") ->
     return df  # Will return empty DataFrame if both failed
 
 
-
+def _split_batch(raw: pd.DataFrame, tickers: list) -> dict:
+    """Split a multi-ticker yf.download result into one raw frame per ticker."""
+    if raw is None or raw.empty:
+        return {}
+
+    if not isinstance(raw.columns, pd.MultiIndex):
+        # A single ticker can come back flat
+        return {tickers[0]: raw} if len(tickers) == 1 else {}
+
+    # group_by="ticker" puts the ticker on level 0, but older yfinance versions put it on level 1
+    level = 0 if set(tickers) & set(raw.columns.get_level_values(0)) else 1
+    available = set(raw.columns.get_level_values(level))
+
+    frames = {}
+    for ticker in tickers:
+        if ticker in available:
+            frames[ticker] = raw.xs(ticker, axis=1, level=level).dropna(how="all")
+    return frames
+
+
+def fetch_price_data_many(symbols, period: str = "9mo", interval: str = "1d", batch_size: int = 100,
+                          start=None) -> pd.DataFrame:
+    """
+    Fetch OHLCV for many symbols with bulk yfinance calls.
+    Returns a long frame with PRICE_COLUMNS; symbols that come back empty or
+    short from yfinance are retried one by one through nsepython.
+    """
+    min_rows = 1 if start is not None else MIN_ROWS
+    symbols = list(dict.fromkeys(s.strip().upper() for s in symbols if s and s.strip()))
+    frames = []
+    missing = []
+
+    for offset in range(0, len(symbols), batch_size):
+        batch = symbols[offset:offset + batch_size]
+        tickers = [s + ".NS" for s in batch]
+        print(f"[fetch_price_data_many] Downloading {len(batch)} symbols ({offset + 1}-{offset + len(batch)} of {len(symbols)})")
+
+        try:
+            if start is not None:
+                raw = yf.download(tickers, start=start, interval=interval, group_by="ticker",
+                                  threads=True, progress=False)
+            else:
+                raw = yf.download(tickers, period=period, interval=interval, group_by="ticker",
+                                  threads=True, progress=False)
+            per_ticker = _split_batch(raw, tickers)
+        except Exception as e:
+            print(f"[fetch_price_data_many] ❌ YFinance batch error: {e}")
+            per_ticker = {}
+
+        for symbol, ticker in zip(batch, tickers):
+            try:
+                df = _normalize_yf_frame(per_ticker[ticker], symbol) if ticker in per_ticker else pd.DataFrame()
+                df = df[df["close"].notnull()] if not df.empty else df
+            except Exception as e:
+                print(f"[fetch_price_data_many] ⚠️ Could not parse {symbol}: {e}")
+                df = pd.DataFrame()
+
+            if len(df) >= min_rows:
+                frames.append(df)
+            else:
+                missing.append(symbol)
+
+    if missing:
+        print(f"[fetch_price_data_many] 🔁 Falling back to nsepython for {len(missing)} symbols: {missing}")
+    for symbol in missing:
+        try:
+            frames.append(_fetch_from_nse(symbol, start=start))
+        except Exception as e:
+            print(f"[fetch_price_data_many] ❌ NSE fallback failed for {symbol}: {e}")
+
+    if not frames:
+        return pd.DataFrame(columns=PRICE_COLUMNS)
+
+    result = pd.concat(frames, ignore_index=True)
+    print(f"[fetch_price_data_many] ✅ {result['symbol'].nunique()}/{len(symbols)} symbols, rows: {len(result)}")
+    return result.sort_values(["symbol", "date"]).reset_index(drop=True)
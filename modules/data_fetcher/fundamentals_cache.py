@@ -0,0 +1,95 @@
+# modules/data_fetcher/fundamentals_cache.py
+#
+# Persistent per-symbol cache for fetch_company_info results with per-field TTLs.
+# Each symbol is one JSON file under data/cache/fundamentals/:
+#   {"fields": {...}, "fetched_at": {"sector": 1718000000.0, "currentPrice": ...}}
+
+import json
+import os
+import threading
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+CACHE_DIR = os.path.join(PROJECT_ROOT, "data", "cache", "fundamentals")
+
+MINUTE = 60
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+
+# Fields refreshed from fast_info alone (cheap); everything else needs ticker.info
+PRICE_FIELDS = {"currentPrice"}
+
+FIELD_TTLS = {
+    "companyName": 7 * DAY,
+    "sector": 7 * DAY,
+    "industry": 7 * DAY,
+    "isin": 7 * DAY,
+    "faceValue": 7 * DAY,
+    "marketCap": HOUR,
+    "pe": HOUR,
+    "currentPrice": 5 * MINUTE,
+}
+DEFAULT_TTL = DAY  # bookValue, roe, roce, debt and the raw yfinance extras
+
+_memory = {}
+_lock = threading.Lock()
+
+
+def _cache_path(symbol: str) -> str:
+    return os.path.join(CACHE_DIR, f"{symbol.upper()}.json")
+
+
+def load(symbol: str):
+    """Cached entry for a symbol, or None."""
+    symbol = symbol.upper()
+    with _lock:
+        if symbol in _memory:
+            return _memory[symbol]
+
+    path = _cache_path(symbol)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path) as f:
+            entry = json.load(f)
+    except Exception as e:
+        print(f"[fundamentals_cache] Ignoring unreadable cache for {symbol}: {e}")
+        return None
+
+    with _lock:
+        _memory[symbol] = entry
+    return entry
+
+
+def store(symbol: str, fields: dict, now: float = None) -> dict:
+    """Merge freshly fetched fields into the cache entry and persist it."""
+    symbol = symbol.upper()
+    now = now or time.time()
+    entry = load(symbol) or {"fields": {}, "fetched_at": {}}
+    entry = {"fields": {**entry["fields"], **fields},
+             "fetched_at": {**entry["fetched_at"], **{k: now for k in fields}}}
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    path = _cache_path(symbol)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(entry, f, default=str)
+    os.replace(tmp_path, path)
+
+    with _lock:
+        _memory[symbol] = entry
+    return entry
+
+
+def stale_fields(entry: dict, now: float = None) -> set:
+    now = now or time.time()
+    return {field for field, fetched_at in entry["fetched_at"].items()
+            if now - fetched_at > FIELD_TTLS.get(field, DEFAULT_TTL)}
+
+
+def fetched_at(symbol: str):
+    """Time of the most recent fetch for any field of a symbol, or None if uncached."""
+    entry = load(symbol)
+    if not entry or not entry["fetched_at"]:
+        return None
+    return max(entry["fetched_at"].values())
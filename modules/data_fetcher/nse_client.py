@@ -0,0 +1,196 @@
+# modules/data_fetcher/nse_client.py
+#
+# One shared HTTP client for nseindia.com:
+#   - cookie bootstrap done once, refreshed on 401/403
+#   - token-bucket rate limiter shared by every caller (thread-safe)
+#   - adaptive backoff on 429/5xx (honours Retry-After, slows the bucket down)
+#   - pooled keep-alive connections
+#
+# from modules.data_fetcher.nse_client import get_nse_client
+# rows = get_nse_client().index_data("NIFTY 50")
+
+import os
+import random
+import threading
+import time
+from urllib.parse import quote
+
+import requests
+from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+
+load_dotenv()
+
+BASE_URL = "https://www.nseindia.com"
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)",
+    "Accept": "application/json, text/plain, */*",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Referer": "https://www.nseindia.com/",
+    "Connection": "keep-alive"
+}
+
+# Tunables (override through the environment / .env)
+NSE_REQUESTS_PER_SEC = float(os.getenv("NSE_REQUESTS_PER_SEC", "3"))
+NSE_BURST = int(os.getenv("NSE_BURST", "5"))
+NSE_MAX_RETRIES = int(os.getenv("NSE_MAX_RETRIES", "4"))
+NSE_POOL_SIZE = int(os.getenv("NSE_POOL_SIZE", "10"))
+NSE_TIMEOUT = 10
+
+# Broad-market and sectoral indices served by /api/equity-stockIndices
+BROAD_INDICES = [
+    "NIFTY 50", "NIFTY NEXT 50", "NIFTY 100", "NIFTY 200", "NIFTY 500",
+    "NIFTY MIDCAP 50", "NIFTY MIDCAP 100", "NIFTY MIDCAP 150",
+    "NIFTY SMALLCAP 50", "NIFTY SMALLCAP 100", "NIFTY SMALLCAP 250",
+    "NIFTY MIDSMALLCAP 400", "NIFTY LARGEMIDCAP 250",
+]
+SECTORAL_INDICES = [
+    "NIFTY AUTO", "NIFTY BANK", "NIFTY ENERGY", "NIFTY FINANCIAL SERVICES",
+    "NIFTY FMCG", "NIFTY IT", "NIFTY MEDIA", "NIFTY METAL", "NIFTY PHARMA",
+    "NIFTY PSU BANK", "NIFTY PRIVATE BANK", "NIFTY REALTY", "NIFTY HEALTHCARE INDEX",
+    "NIFTY CONSUMER DURABLES", "NIFTY OIL & GAS",
+]
+ALL_INDICES = BROAD_INDICES + SECTORAL_INDICES
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+AUTH_STATUSES = {401, 403}
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket. `rate` tokens are added per second up to `capacity`.
+    slow_down()/speed_up() implement multiplicative decrease / additive increase
+    so the effective rate settles at what the server tolerates.
+    """
+
+    def __init__(self, rate: float, capacity: int, min_rate: float = None):
+        self.max_rate = rate
+        self.min_rate = min_rate or rate / 8
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, tokens: float = 1.0):
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                wait = (tokens - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def slow_down(self):
+        with self.lock:
+            self._refill()
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.tokens = 0.0
+
+    def speed_up(self):
+        with self.lock:
+            if self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+
+
+class NSEClient:
+    def __init__(self, rate: float = NSE_REQUESTS_PER_SEC, burst: int = NSE_BURST,
+                 max_retries: int = NSE_MAX_RETRIES, pool_size: int = NSE_POOL_SIZE, timeout: float = NSE_TIMEOUT):
+        self.limiter = TokenBucket(rate, burst)
+        self.max_retries = max_retries
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        self.session.headers.update(HEADERS)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+
+        self._bootstrapped = False
+        self._bootstrap_lock = threading.Lock()
+
+    def bootstrap(self, force: bool = False):
+        """Visit the homepage once so NSE sets the cookies its API requires."""
+        with self._bootstrap_lock:
+            if self._bootstrapped and not force:
+                return
+            self.limiter.acquire()
+            self.session.cookies.clear()
+            self.session.get(BASE_URL, timeout=self.timeout)
+            self._bootstrapped = True
+            print("[nse_client] Session cookies initialised")
+
+    def _backoff(self, attempt: int, response=None) -> float:
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+        return min(30.0, (2 ** attempt) * 0.5) + random.uniform(0, 0.5)
+
+    def get(self, url: str, params: dict = None) -> requests.Response:
+        """GET an NSE URL (absolute or /api/... path) with rate limiting, cookie refresh and retries."""
+        if url.startswith("/"):
+            url = BASE_URL + url
+        self.bootstrap()
+
+        response = None
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire()
+            try:
+                response = self.session.get(url, params=params, timeout=self.timeout)
+            except requests.RequestException as e:
+                if attempt == self.max_retries:
+                    raise
+                print(f"[nse_client] {e} – retrying ({attempt + 1}/{self.max_retries})")
+                time.sleep(self._backoff(attempt))
+                continue
+
+            if response.status_code in AUTH_STATUSES and attempt < self.max_retries:
+                print(f"[nse_client] HTTP {response.status_code} – refreshing cookies")
+                self.bootstrap(force=True)
+                continue
+
+            if response.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                delay = self._backoff(attempt, response)
+                print(f"[nse_client] HTTP {response.status_code} – backing off {delay:.1f}s")
+                self.limiter.slow_down()
+                time.sleep(delay)
+                continue
+
+            if response.status_code == 200:
+                self.limiter.speed_up()
+            return response
+
+        return response
+
+    def get_json(self, url: str, params: dict = None):
+        response = self.get(url, params=params)
+        response.raise_for_status()
+        return response.json()
+
+    def index_data(self, index_name: str) -> list:
+        """Constituent rows for an index from /api/equity-stockIndices."""
+        data = self.get_json(f"/api/equity-stockIndices?index={quote(index_name)}")
+        return data.get("data", [])
+
+    def quote_equity(self, symbol: str) -> dict:
+        """Same payload as nsepython.nse_eq(symbol)."""
+        return self.get_json(f"/api/quote-equity?symbol={quote(symbol)}")
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_nse_client() -> NSEClient:
+    """Process-wide NSEClient so every fetcher shares one cookie jar, pool and rate limit."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = NSEClient()
+        return _client
@@ -0,0 +1,269 @@
+# modules/data_fetcher/price_store.py
+#
+# Per-symbol OHLCV store under data/prices/<interval>/<SYMBOL>.parquet.
+# Reads never touch the network; updates only download the bars after the
+# last stored date and append them.
+
+import math
+import os
+import time
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+
+from modules.data_fetcher.fetch_price_data import PRICE_COLUMNS, fetch_price_data, fetch_price_data_many
+from modules.utils.helpers import atomic_write_parquet, path_lock
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+PRICE_STORE_DIR = os.path.join(PROJECT_ROOT, "data", "prices")
+
+MARKET_TZ = ZoneInfo("Asia/Kolkata")
+MARKET_CLOSE = (15, 30)
+
+# Seconds per bar for intraday intervals; a store is fresh while its last check is younger than one bar
+INTRADAY_SECONDS = {
+    "1m": 60, "2m": 120, "5m": 300, "15m": 900, "30m": 1800,
+    "60m": 3600, "90m": 5400, "1h": 3600,
+}
+# Daily stores are re-checked at most this often when the expected session is missing (e.g. holidays)
+DAILY_RECHECK_SECONDS = 15 * 60
+# Stored history may start this many days after the requested window start (weekends, holidays)
+BACKFILL_TOLERANCE_DAYS = 7
+
+# Used to turn a bar count into calendar days: NSE session length and a holiday allowance
+SESSION_MINUTES = 375
+TRADING_DAYS_PER_WEEK = 5
+HOLIDAY_ALLOWANCE = 0.06
+
+# Day counts yfinance accepts as a period; other "<n>d" periods are downloaded with a start date
+YF_DAY_PERIODS = {"1d", "5d"}
+
+# Callables (symbol, interval) run after a symbol's bars are rewritten, e.g. cache invalidation
+_update_listeners = []
+
+
+def _store_path(symbol: str, interval: str) -> str:
+    return os.path.join(PRICE_STORE_DIR, interval, f"{symbol.upper()}.parquet")
+
+
+def _period_offset(period: str):
+    """Translate a yfinance period string ("9mo", "1y", "5d") into a DateOffset. None means 'max'."""
+    period = period.strip().lower()
+    if period in ("max", "ytd"):
+        return None
+    units = {"mo": "months", "y": "years", "wk": "weeks", "d": "days"}
+    for suffix, unit in units.items():
+        if period.endswith(suffix) and period[:-len(suffix)].isdigit():
+            return pd.DateOffset(**{unit: int(period[:-len(suffix)])})
+    raise ValueError(f"Unsupported period: {period}")
+
+
+def history_days(bars: int, interval: str = "1d") -> int:
+    """Calendar days that hold at least `bars` bars of `interval`, allowing for weekends and holidays."""
+    if interval == "1wk":
+        return (bars + 1) * 7
+    if interval == "1mo":
+        return (bars + 1) * 31
+    sessions = bars
+    if interval in INTRADAY_SECONDS:
+        sessions = math.ceil(bars * INTRADAY_SECONDS[interval] / (SESSION_MINUTES * 60))
+    return math.ceil(sessions * 7 / TRADING_DAYS_PER_WEEK * (1 + HOLIDAY_ALLOWANCE)) + 3
+
+
+def period_for_bars(bars: int, interval: str = "1d") -> str:
+    """Period string ("165d") for get_price_history / update_prices covering `bars` bars."""
+    return f"{history_days(bars, interval)}d"
+
+
+def _download_args(period: str) -> dict:
+    """yfinance arguments for a full download of `period` (e.g. "165d" from period_for_bars)."""
+    period = period.strip().lower()
+    if not period.endswith("d") or period in YF_DAY_PERIODS:
+        return {"period": period}
+    return {"start": (pd.Timestamp.now(tz=MARKET_TZ).tz_localize(None) - _period_offset(period)).date()}
+
+
+def _now_like(dates: pd.Series) -> pd.Timestamp:
+    tz = getattr(dates.dt, "tz", None)
+    now = pd.Timestamp.now(tz=MARKET_TZ)
+    return now.tz_convert(tz) if tz is not None else now.tz_localize(None)
+
+
+def _last_expected_session(now: datetime = None):
+    """Date of the most recent daily bar that should exist (ignores exchange holidays)."""
+    now = now or datetime.now(MARKET_TZ)
+    day = now.date()
+    if (now.hour, now.minute) < MARKET_CLOSE:
+        day -= timedelta(days=1)
+    while day.weekday() >= 5:
+        day -= timedelta(days=1)
+    return day
+
+
+def _normalize(df: pd.DataFrame) -> pd.DataFrame:
+    df = df[PRICE_COLUMNS].copy()
+    df["date"] = pd.to_datetime(df["date"])
+    for col in ["open", "high", "low", "close", "volume"]:
+        df[col] = pd.to_numeric(df[col], errors="coerce").astype("float64")
+    df["symbol"] = df["symbol"].astype(str).str.upper()
+    return df[df["close"].notnull()]
+
+
+def read_prices(symbol: str, interval: str = "1d", start=None, end=None, last_n: int = None) -> pd.DataFrame:
+    """Read stored bars for a symbol without hitting the network. Returns an empty frame if nothing is stored."""
+    path = _store_path(symbol, interval)
+    if not os.path.exists(path):
+        return pd.DataFrame(columns=PRICE_COLUMNS)
+
+    df = pd.read_parquet(path)
+    if start is not None:
+        df = df[df["date"] >= pd.Timestamp(start)]
+    if end is not None:
+        df = df[df["date"] <= pd.Timestamp(end)]
+    if last_n is not None:
+        df = df.tail(last_n)
+    return df.reset_index(drop=True)
+
+
+def last_stored_date(symbol: str, interval: str = "1d"):
+    path = _store_path(symbol, interval)
+    if not os.path.exists(path):
+        return None
+    dates = pd.read_parquet(path, columns=["date"])["date"]
+    return dates.max() if not dates.empty else None
+
+
+def register_update_listener(listener):
+    """Call listener(symbol, interval) whenever append_prices writes bars for a symbol."""
+    if listener not in _update_listeners:
+        _update_listeners.append(listener)
+
+
+def _notify_update(symbol: str, interval: str):
+    for listener in _update_listeners:
+        try:
+            listener(symbol, interval)
+        except Exception as e:
+            print(f"[price_store] Update listener failed for {symbol}: {e}")
+
+
+def append_prices(df: pd.DataFrame, interval: str = "1d") -> int:
+    """Merge new bars into the store (dedup on date, newest wins). Returns the number of new dates added."""
+    if df is None or df.empty:
+        return 0
+
+    added = 0
+    for symbol, new_rows in _normalize(df).groupby("symbol"):
+        path = _store_path(symbol, interval)
+        with path_lock(path):
+            existing = pd.read_parquet(path) if os.path.exists(path) else pd.DataFrame(columns=PRICE_COLUMNS)
+            before = len(existing)
+            merged = pd.concat([existing, new_rows], ignore_index=True) if before else new_rows
+            merged = merged.drop_duplicates(subset="date", keep="last").sort_values("date")
+            atomic_write_parquet(merged.reset_index(drop=True), path)
+            added += len(merged) - before
+        # Also fires when only the forming bar was rewritten, since its values changed
+        _notify_update(symbol, interval)
+    return added
+
+
+def _touch(symbol: str, interval: str):
+    path = _store_path(symbol, interval)
+    if os.path.exists(path):
+        os.utime(path, None)
+
+
+def _is_fresh(symbol: str, interval: str, stored: pd.DataFrame = None) -> bool:
+    path = _store_path(symbol, interval)
+    if not os.path.exists(path):
+        return False
+
+    checked_age = time.time() - os.path.getmtime(path)
+    if interval in INTRADAY_SECONDS:
+        return checked_age < INTRADAY_SECONDS[interval]
+
+    last_date = stored["date"].max() if stored is not None and not stored.empty else last_stored_date(symbol, interval)
+    if last_date is not None and pd.Timestamp(last_date).date() >= _last_expected_session():
+        return True
+    return checked_age < DAILY_RECHECK_SECONDS
+
+
+def _covers_period(df: pd.DataFrame, period: str) -> bool:
+    if df.empty:
+        return False
+    offset = _period_offset(period)
+    if offset is None:
+        return True
+    wanted_start = _now_like(df["date"]) - offset
+    return df["date"].min() <= wanted_start + pd.Timedelta(days=BACKFILL_TOLERANCE_DAYS)
+
+
+def _window(df: pd.DataFrame, period: str) -> pd.DataFrame:
+    offset = _period_offset(period)
+    if df.empty or offset is None:
+        return df.reset_index(drop=True)
+    return df[df["date"] >= _now_like(df["date"]) - offset].reset_index(drop=True)
+
+
+def update_prices(symbol: str, period: str = "9mo", interval: str = "1d") -> int:
+    """Bring the store up to date: full download if it doesn't cover `period`, otherwise fetch since the last bar."""
+    symbol = symbol.upper()
+    stored = read_prices(symbol, interval)
+
+    if not _covers_period(stored, period):
+        print(f"[price_store] {symbol}: no usable history, downloading {period}")
+        fresh = fetch_price_data(symbol, interval=interval, **_download_args(period))
+    else:
+        # Start from the last stored bar so a bar that was still forming gets overwritten
+        since = stored["date"].max()
+        print(f"[price_store] {symbol}: fetching bars since {since}")
+        fresh = fetch_price_data(symbol, interval=interval, start=since)
+
+    added = append_prices(fresh, interval)
+    _touch(symbol, interval)
+    print(f"[price_store] {symbol}: {added} new bars stored")
+    return added
+
+
+def update_prices_many(symbols, period: str = "9mo", interval: str = "1d") -> int:
+    """Update many symbols with bulk downloads, grouping stale symbols by their last stored date."""
+    symbols = [s.upper() for s in symbols]
+    to_backfill = []
+    by_since = {}
+
+    for symbol in symbols:
+        stored = read_prices(symbol, interval)
+        if not _covers_period(stored, period):
+            to_backfill.append(symbol)
+        elif not _is_fresh(symbol, interval, stored):
+            by_since.setdefault(stored["date"].max(), []).append(symbol)
+
+    added = 0
+    if to_backfill:
+        added += append_prices(fetch_price_data_many(to_backfill, interval=interval, **_download_args(period)), interval)
+    for since, group in by_since.items():
+        added += append_prices(fetch_price_data_many(group, interval=interval, start=since), interval)
+
+    for symbol in to_backfill + [s for group in by_since.values() for s in group]:
+        _touch(symbol, interval)
+    print(f"[price_store] Updated {len(to_backfill) + sum(map(len, by_since.values()))}/{len(symbols)} symbols, "
+          f"{added} new bars")
+    return added
+
+
+def get_price_history(symbol: str, period: str = "9mo", interval: str = "1d", refresh: bool = True) -> pd.DataFrame:
+    """
+    Return the last `period` of bars for a symbol from the local store.
+    With refresh=True the missing bars are fetched first, unless the store is already fresh.
+    """
+    symbol = symbol.upper()
+    stored = read_prices(symbol, interval)
+    if refresh and (not _covers_period(stored, period) or not _is_fresh(symbol, interval, stored)):
+        try:
+            update_prices(symbol, period=period, interval=interval)
+            stored = read_prices(symbol, interval)
+        except Exception as e:
+            print(f"[price_store] ⚠️ Update failed for {symbol}, serving stored data: {e}")
+
+    return _window(stored, period)
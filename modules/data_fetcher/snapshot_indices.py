@@ -1,47 +1,43 @@
 # File: modules/data_fetcher/snapshot_indices.py
 
+import asyncio
 import os
-import requests
 import pandas as pd
-from urllib.parse import quote
 from datetime import datetime
-import time
 
-HEADERS = {
-    "User-Agent": "Mozilla/5.0",
-    "Accept": "application/json",
-    "Referer": "https://www.nseindia.com"
-}
+from modules.data_fetcher.nse_client import ALL_INDICES, get_nse_client
 
 # Step 1: Set global path to data/raw/snapshots/indices
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 SNAPSHOT_DIR = os.path.join(PROJECT_ROOT, "data", "snapshots", "indices")
 os.makedirs(SNAPSHOT_DIR, exist_ok=True)
 
-# Step 2: NSE Indices you want to snapshot
-INDEX_LIST = [
-    "NIFTY 50", "NIFTY AUTO"
-    # Add more if needed
-]
+# Step 2: NSE Indices you want to snapshot (all broad + sectoral indices)
+INDEX_LIST = ALL_INDICES
 
-def fetch_index_snapshot(index_name, session) -> pd.DataFrame:
+# Concurrent requests in flight; the shared client's token bucket still caps the request rate
+MAX_CONCURRENCY = 8
+
+
+def _snapshot_path(index_name, date_str):
+    stem = index_name.lower().replace(' ', '_').replace('&', 'and').replace('/', '_')
+    return os.path.join(SNAPSHOT_DIR, f"{stem}_{date_str}.csv")
+
+
+def fetch_index_snapshot(index_name, client=None) -> pd.DataFrame:
     """Fetch index data from NSE."""
-    url = f"https://www.nseindia.com/api/equity-stockIndices?index={quote(index_name)}"
+    client = client or get_nse_client()
     try:
-        response = session.get(url, headers=HEADERS, timeout=10)
-        if response.status_code == 200:
-            return pd.DataFrame(response.json().get("data", []))
-        else:
-            print(f"[{index_name}] HTTP Error: {response.status_code}")
+        return pd.DataFrame(client.index_data(index_name))
     except Exception as e:
         print(f"[{index_name}] Error: {e}")
     return None
 
 def snapshot_all_indices():
     """Fetch and save daily snapshot for each index."""
-    session = requests.Session()
+    client = get_nse_client()
     try:
-        session.get("https://www.nseindia.com", headers=HEADERS, timeout=10)
+        client.bootstrap()
     except Exception as e:
         print(f"Session Init Error: {e}")
         return
@@ -50,15 +46,58 @@ def snapshot_all_indices():
 
     for index in INDEX_LIST:
         print(f"Fetching: {index}")
-        df = fetch_index_snapshot(index, session)
+        df = fetch_index_snapshot(index, client)
         if df is not None and not df.empty:
-            file_name = f"{index.lower().replace(' ', '_')}_{today_str}.csv"
-            save_path = os.path.join(SNAPSHOT_DIR, file_name)
+            save_path = _snapshot_path(index, today_str)
             df.to_csv(save_path, index=False)
             print(f"Saved {len(df)} rows → {save_path}")
         else:
             print(f"No data for: {index}")
-        time.sleep(10)  # Increase delay to reduce risk of blocking
+
+
+async def snapshot_all_indices_async(index_list=None, max_concurrency=MAX_CONCURRENCY):
+    """
+    Fetch every index concurrently (bounded by max_concurrency and the client's rate limit),
+    then write all snapshots for one timestamp in a single pass.
+    Returns the combined snapshot DataFrame.
+    """
+    index_list = index_list or INDEX_LIST
+    client = get_nse_client()
+    try:
+        await asyncio.to_thread(client.bootstrap)
+    except Exception as e:
+        print(f"Session Init Error: {e}")
+        return None
+
+    snapshot_time = datetime.now()
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def fetch(index):
+        async with semaphore:
+            return index, await asyncio.to_thread(fetch_index_snapshot, index, client)
+
+    results = await asyncio.gather(*(fetch(index) for index in index_list))
+
+    date_str = snapshot_time.strftime("%Y-%m-%d")
+    frames = []
+    for index, df in results:
+        if df is None or df.empty:
+            print(f"No data for: {index}")
+            continue
+        save_path = _snapshot_path(index, date_str)
+        df.to_csv(save_path, index=False)
+        print(f"Saved {len(df)} rows → {save_path}")
+        frames.append(df.assign(index_name=index, snapshot_time=snapshot_time))
+
+    if not frames:
+        return None
+
+    combined = pd.concat(frames, ignore_index=True)
+    combined_path = _snapshot_path("all_indices", date_str)
+    combined.to_csv(combined_path, index=False)
+    print(f"Saved {len(frames)}/{len(index_list)} indices ({len(combined)} rows) → {combined_path}")
+    return combined
+
 
 if __name__ == "__main__":
-    snapshot_all_indices()
+    asyncio.run(snapshot_all_indices_async())
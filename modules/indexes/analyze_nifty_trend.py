@@ -2,12 +2,19 @@ import pandas as pd
 import yfinance as yf
 from datetime import datetime, timedelta
 
+from modules.data_fetcher.price_store import history_days
 from modules.indicators.indicators import apply_all_indicators
+from modules.indicators.registry import required_history_bars
 from modules.utils.telegram_sender import send_telegram_message
 
 
-def fetch_nifty_data(period="2mo", interval="1d") -> pd.DataFrame:
-    df = yf.download("^NSEI", period=period, interval=interval, progress=False)
+def fetch_nifty_data(period=None, interval="1d", config: dict = None) -> pd.DataFrame:
+    """NIFTY OHLCV; by default just enough history for the configured indicators to converge."""
+    if period is None:
+        days = history_days(required_history_bars(config), interval)
+        df = yf.download("^NSEI", start=datetime.now() - timedelta(days=days), interval=interval, progress=False)
+    else:
+        df = yf.download("^NSEI", period=period, interval=interval, progress=False)
     df.reset_index(inplace=True)
     df.rename(columns=str.lower, inplace=True)
     return df
@@ -17,11 +24,12 @@ def interpret_nifty_trend(df: pd.DataFrame) -> str:
     df = apply_all_indicators(df)
 
     latest = df.iloc[-1]
+    st_dir_col = next((col for col in df.columns if col.startswith("supertrend_") and col.endswith("_dir")), None)
 
     signals = {
         "RSI": latest.get("rsi", 0) > 60,
         "MACD": latest.get("macd", 0) > latest.get("macd_signal", 0),
-        "Supertrend": latest.get("supertrend_signal", "") == "buy",
+        "Supertrend": bool(latest[st_dir_col]) if st_dir_col else False,
         "ADX": latest.get("adx", 0) > 20 and latest.get("di_plus", 0) > latest.get("di_minus", 0)
     }
 
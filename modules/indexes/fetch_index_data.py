@@ -3,7 +3,10 @@
 import pandas as pd
 import yfinance as yf
 from nsepython import nsefetch
-from datetime import datetime
+from datetime import datetime, timedelta
+
+from modules.data_fetcher.price_store import history_days
+from modules.indicators.registry import required_history_bars
 
 # Index codes for display/logging
 INDEX_SYMBOLS = {
@@ -31,9 +34,10 @@ def get_index_constituents(index_name):
         print(f"[ERROR] Fetching constituents for {index_name}: {e}")
         return []
 
-def get_index_historical(index_name, period="6mo", interval="1d"):
+def get_index_historical(index_name, period=None, interval="1d", config=None):
     """
     Returns historical OHLCV data using yfinance (for indicators).
+    Without a period, downloads just the warm-up the indicator config needs.
     """
     symbol_map = {
         "NIFTY 50": "^NSEI",
@@ -42,7 +46,11 @@ def get_index_historical(index_name, period="6mo", interval="1d"):
 
     try:
         symbol = symbol_map[index_name]
-        df = yf.download(symbol, period=period, interval=interval, progress=False, auto_adjust=False)
+        if period is None:
+            start = datetime.now() - timedelta(days=history_days(required_history_bars(config), interval))
+            df = yf.download(symbol, start=start, interval=interval, progress=False, auto_adjust=False)
+        else:
+            df = yf.download(symbol, period=period, interval=interval, progress=False, auto_adjust=False)
         df.dropna(inplace=True)
         df.reset_index(inplace=True)
         return df
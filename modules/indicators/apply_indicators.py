@@ -1,9 +1,10 @@
 import pandas as pd
-import numpy as np
 from ta.momentum import RSIIndicator
 from ta.trend import MACD, ADXIndicator
 from ta.volatility import BollingerBands, AverageTrueRange
 
+from modules.indicators.kernels import supertrend
+
 
 def apply_all_indicators(df: pd.DataFrame) -> pd.DataFrame:
     if df is None or df.empty:
@@ -41,26 +42,6 @@ def apply_all_indicators(df: pd.DataFrame) -> pd.DataFrame:
 
 
 def compute_supertrend(df, period=10, multiplier=3):
-    atr = AverageTrueRange(df['High'], df['Low'], df['Close'], window=period).average_true_range()
-    hl2 = (df['High'] + df['Low']) / 2
-    upperband = hl2 + (multiplier * atr)
-    lowerband = hl2 - (multiplier * atr)
-
-    supertrend = [np.nan] * len(df)
-    direction = [True] * len(df)
-
-    for i in range(period, len(df)):
-        if df['Close'].iloc[i] > upperband.iloc[i - 1]:
-            direction[i] = True
-        elif df['Close'].iloc[i] < lowerband.iloc[i - 1]:
-            direction[i] = False
-        else:
-            direction[i] = direction[i - 1]
-            if direction[i] and lowerband.iloc[i] < lowerband.iloc[i - 1]:
-                lowerband.iloc[i] = lowerband.iloc[i - 1]
-            if not direction[i] and upperband.iloc[i] > upperband.iloc[i - 1]:
-                upperband.iloc[i] = upperband.iloc[i - 1]
-
-        supertrend[i] = lowerband.iloc[i] if direction[i] else upperband.iloc[i]
-
-    return direction, supertrend
+    result = supertrend(df['High'].to_numpy(), df['Low'].to_numpy(), df['Close'].to_numpy(),
+                        period=period, multiplier=multiplier)
+    return result["direction"], result["supertrend"]
@@ -0,0 +1,122 @@
+# modules/indicators/indicator_cache.py
+#
+# Memoizes indicator frames keyed by (symbol, interval, price window, config hash).
+# Two tiers: an in-process LRU and Parquet files under data/cache/indicators/.
+# Entries for a symbol are dropped whenever the price store writes new bars
+# for it, so a repeat request within the trading day skips indicator work.
+#
+# from modules.indicators.indicator_cache import cached_indicators
+# df = cached_indicators("TCS", price_df, config, compute=apply_all_indicators)
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from modules.data_fetcher import price_store
+from modules.indicators.registry import DEFAULT_CONFIG
+from modules.utils.helpers import atomic_write_parquet
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+CACHE_DIR = os.path.join(PROJECT_ROOT, "data", "cache", "indicators")
+
+MEMORY_ENTRIES = 128
+
+_memory = OrderedDict()
+_lock = threading.Lock()
+
+
+def normalize_config(config: dict = None) -> dict:
+    merged = {**DEFAULT_CONFIG, **(config or {})}
+    # 2 and 2.0 produce the same indicators
+    return {k: float(v) if isinstance(v, (int, float)) and not isinstance(v, bool) else v
+            for k, v in sorted(merged.items())}
+
+
+def config_hash(config: dict = None) -> str:
+    payload = json.dumps(normalize_config(config), sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()[:12]
+
+
+def make_key(symbol: str, interval: str, prices: pd.DataFrame, config: dict = None) -> tuple:
+    """
+    Cache key for a price window. Besides the last bar, the first bar and row count are
+    part of the key because EMA/Wilder values depend on how much history was used.
+    """
+    dates = pd.to_datetime(prices["date"])
+    window = f"{dates.min():%Y%m%d%H%M}-{dates.max():%Y%m%d%H%M}-{len(prices)}"
+    return symbol.upper(), interval, window, config_hash(config)
+
+
+def _disk_path(key: tuple) -> str:
+    symbol, interval, window, digest = key
+    return os.path.join(CACHE_DIR, interval, symbol, f"{window}_{digest}.parquet")
+
+
+def get(key: tuple):
+    with _lock:
+        if key in _memory:
+            _memory.move_to_end(key)
+            return _memory[key].copy()
+
+    path = _disk_path(key)
+    if not os.path.exists(path):
+        return None
+    try:
+        df = pd.read_parquet(path)
+    except Exception as e:
+        print(f"[indicator_cache] Ignoring unreadable cache file {path}: {e}")
+        return None
+    _remember(key, df)
+    return df.copy()
+
+
+def put(key: tuple, df: pd.DataFrame, persist: bool = True):
+    _remember(key, df.copy())
+    if persist:
+        try:
+            atomic_write_parquet(df, _disk_path(key))
+        except Exception as e:
+            print(f"[indicator_cache] Could not persist {key}: {e}")
+
+
+def _remember(key, df):
+    with _lock:
+        _memory[key] = df
+        _memory.move_to_end(key)
+        while len(_memory) > MEMORY_ENTRIES:
+            _memory.popitem(last=False)
+
+
+def invalidate(symbol: str, interval: str = None):
+    """Drop every cached entry for a symbol (optionally only one interval), in memory and on disk."""
+    symbol = symbol.upper()
+    with _lock:
+        for key in [k for k in _memory if k[0] == symbol and (interval is None or k[1] == interval)]:
+            del _memory[key]
+
+    intervals = [interval] if interval else (os.listdir(CACHE_DIR) if os.path.isdir(CACHE_DIR) else [])
+    for iv in intervals:
+        shutil.rmtree(os.path.join(CACHE_DIR, iv, symbol), ignore_errors=True)
+
+
+def cached_indicators(symbol: str, prices: pd.DataFrame, config: dict = None, compute=None,
+                      interval: str = "1d") -> pd.DataFrame:
+    """Return compute(prices, config), reusing a cached result for the same window and config."""
+    key = make_key(symbol, interval, prices, config)
+    df = get(key)
+    if df is not None:
+        print(f"[indicator_cache] Hit for {symbol} ({interval})")
+        return df
+
+    df = compute(prices.copy(), dict(config or {}))
+    put(key, df)
+    return df
+
+
+# New or rewritten bars make cached results for that symbol stale
+price_store.register_update_listener(lambda symbol, interval: invalidate(symbol, interval))
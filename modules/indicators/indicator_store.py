@@ -0,0 +1,88 @@
+# modules/indicators/indicator_store.py
+#
+# Per-symbol indicator outputs: data/processed/indicators/<interval>/<SYMBOL>.parquet.
+# Indicator columns are stored as float32 and the symbol as a categorical;
+# OHLC stays float64 so prices round-trip exactly. Files are written with small
+# row groups, so the latest bars can be read without decoding the whole file.
+#
+# from modules.indicators.indicator_store import write_indicators, latest_indicators
+# write_indicators(df, "TCS")
+# row = latest_indicators("TCS", columns=["close", "rsi_14"])
+
+import os
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from modules.utils.helpers import atomic_write_parquet
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+INDICATOR_STORE_DIR = os.path.join(PROJECT_ROOT, "data", "processed", "indicators")
+
+# Columns kept at full precision; every other float column is narrowed to float32
+EXACT_COLUMNS = {"open", "high", "low", "close", "volume"}
+ROW_GROUP_SIZE = 128
+
+
+def indicator_path(symbol: str, interval: str = "1d") -> str:
+    return os.path.join(INDICATOR_STORE_DIR, interval, f"{symbol.upper()}.parquet")
+
+
+def _compact(df: pd.DataFrame, symbol: str) -> pd.DataFrame:
+    df = df.copy()
+    df["symbol"] = pd.Categorical([symbol.upper()] * len(df))
+    for col in df.columns:
+        if col not in EXACT_COLUMNS and pd.api.types.is_float_dtype(df[col]):
+            df[col] = df[col].astype("float32")
+    if "date" in df.columns:
+        df = df.sort_values("date")
+    return df.reset_index(drop=True)
+
+
+def write_indicators(df: pd.DataFrame, symbol: str, interval: str = "1d") -> str:
+    """Replace the stored indicator frame for a symbol (atomic rename)."""
+    path = indicator_path(symbol, interval)
+    atomic_write_parquet(_compact(df, symbol), path, row_group_size=ROW_GROUP_SIZE)
+    return path
+
+
+def indicator_columns(symbol: str, interval: str = "1d") -> list:
+    """Column names of the stored file (schema only, no data read)."""
+    path = indicator_path(symbol, interval)
+    return pq.read_schema(path).names if os.path.exists(path) else []
+
+
+def read_indicators(symbol: str, interval: str = "1d", columns=None, last_n: int = None) -> pd.DataFrame:
+    """
+    Stored indicators for a symbol (empty frame if none).
+    `columns` projects the read; `last_n` decodes only the trailing row groups.
+    """
+    path = indicator_path(symbol, interval)
+    if not os.path.exists(path):
+        return pd.DataFrame(columns=columns or [])
+
+    pf = pq.ParquetFile(path)
+    if columns is not None:
+        available = set(pf.schema_arrow.names)
+        columns = [col for col in columns if col in available]
+
+    if last_n is None:
+        return pf.read(columns=columns).to_pandas()
+
+    groups = []
+    rows = 0
+    for i in range(pf.num_row_groups - 1, -1, -1):
+        groups.insert(0, i)
+        rows += pf.metadata.row_group(i).num_rows
+        if rows >= last_n:
+            break
+    if not groups:
+        return pf.schema_arrow.empty_table().select(columns or pf.schema_arrow.names).to_pandas()
+    df = pf.read_row_groups(groups, columns=columns).to_pandas()
+    return df.iloc[-last_n:].reset_index(drop=True)
+
+
+def latest_indicators(symbol: str, interval: str = "1d", columns=None):
+    """Most recent stored row as a Series, or None."""
+    df = read_indicators(symbol, interval, columns=columns, last_n=1)
+    return None if df.empty else df.iloc[-1]
@@ -0,0 +1,215 @@
+# modules/indicators/kernels.py
+#
+# NumPy indicator kernels shared by the indicator modules.
+# Every kernel takes raw ndarrays with time on the last axis, so the same call
+# works for one series (bars,) or a block of symbols (symbols, bars).
+# Values follow the `ta` package conventions so results line up with the
+# existing pandas-based columns.
+
+import numpy as np
+import pandas as pd
+
+
+def _as_float(*arrays):
+    return [np.asarray(a, dtype="float64") for a in arrays]
+
+
+def true_range(high, low, close):
+    """max(high - low, |high - prev close|, |low - prev close|); the first bar is high - low."""
+    high, low, close = _as_float(high, low, close)
+    prev_close = np.empty_like(close)
+    prev_close[..., 0] = np.nan
+    prev_close[..., 1:] = close[..., :-1]
+    # fmax skips NaN, so the first bar falls back to high - low like ta's DataFrame.max(axis=1)
+    return np.fmax(np.fmax(high - low, np.abs(high - prev_close)), np.abs(low - prev_close))
+
+
+def _ewm(x, alpha, min_periods=0):
+    """pandas ewm(adjust=False).mean() along the last axis; leading NaNs are skipped."""
+    x = np.asarray(x, dtype="float64")
+    frame = pd.DataFrame(np.atleast_2d(x).T)
+    out = frame.ewm(alpha=alpha, adjust=False, min_periods=min_periods).mean().to_numpy(copy=True).T
+    return out.reshape(x.shape)
+
+
+def _rolling(x, window, how):
+    x = np.asarray(x, dtype="float64")
+    rolling = pd.DataFrame(np.atleast_2d(x).T).rolling(window, min_periods=window)
+    out = rolling.mean() if how == "mean" else rolling.std(ddof=0)
+    return out.to_numpy(copy=True).T.reshape(x.shape)
+
+
+def _wilder_seeded(x, window, seed_start=0):
+    """
+    Wilder average seeded like ta: mean(x[seed_start : seed_start+window]) at bar
+    seed_start+window-1, then avg[i] = (avg[i-1] * (window-1) + x[i]) / window. NaN before the seed.
+    """
+    x = np.asarray(x, dtype="float64")
+    seeded = np.full_like(x, np.nan)
+    seed_bar = seed_start + window - 1
+    if x.shape[-1] > seed_bar:
+        seeded[..., seed_bar] = x[..., seed_start:seed_bar + 1].mean(axis=-1)
+        seeded[..., seed_bar + 1:] = x[..., seed_bar + 1:]
+    return _ewm(seeded, 1 / window)
+
+
+def ema(x, span):
+    """ta's _ema: ewm(span, adjust=False, min_periods=span)."""
+    return _ewm(x, 2 / (span + 1), min_periods=span)
+
+
+def wilder_atr(high, low, close, window=14, tr=None):
+    """
+    Wilder's ATR as computed by ta.volatility.AverageTrueRange:
+    0 for the first window-1 bars, the mean TR at bar window-1, then
+    atr[i] = (atr[i-1] * (window-1) + tr[i]) / window.
+    `tr` (true_range) can be passed in to reuse it.
+    """
+    if tr is None:
+        tr = true_range(high, low, close)
+    atr = _wilder_seeded(tr, window)
+    atr[..., :window - 1] = 0.0
+    return atr
+
+
+def rsi(close, window=14):
+    """ta.momentum.RSIIndicator"""
+    close = np.asarray(close, dtype="float64")
+    diff = np.full_like(close, np.nan)
+    diff[..., 1:] = close[..., 1:] - close[..., :-1]
+    up = np.where(diff > 0, diff, 0.0)
+    down = np.where(diff < 0, -diff, 0.0)
+    ema_up = _ewm(up, 1 / window, min_periods=window)
+    ema_down = _ewm(down, 1 / window, min_periods=window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(ema_down == 0, 100.0, 100 - 100 / (1 + ema_up / ema_down))
+
+
+def macd(close, fast=12, slow=26, signal=9):
+    """ta.trend.MACD; returns (macd, signal)."""
+    line = ema(close, fast) - ema(close, slow)
+    return line, ema(line, signal)
+
+
+def bollinger(close, window=20, std=2):
+    """ta.volatility.BollingerBands; returns (upper, middle, lower)."""
+    middle = _rolling(close, window, "mean")
+    dev = _rolling(close, window, "std")
+    return middle + std * dev, middle, middle - std * dev
+
+
+def directional_movement(high, low):
+    """(+DM, -DM) as in ta.trend.ADXIndicator; 0 on the first bar."""
+    high, low = _as_float(high, low)
+    prev_high = np.full_like(high, np.nan)
+    prev_high[..., 1:] = high[..., :-1]
+    prev_low = np.full_like(low, np.nan)
+    prev_low[..., 1:] = low[..., :-1]
+    up = high - prev_high
+    down = prev_low - low
+    pos = np.where((up > down) & (up > 0), up, 0.0)
+    neg = np.where((down > up) & (down > 0), down, 0.0)
+    return pos, neg
+
+
+def adx(high, low, close, window=14, tr=None, dm=None):
+    """
+    ta.trend.ADXIndicator.adx(): 0 until bar 2*window-1.
+    `tr` (true_range) and `dm` (directional_movement) can be passed in to reuse them.
+    """
+    if tr is None:
+        tr = true_range(high, low, close)
+    pos, neg = dm if dm is not None else directional_movement(high, low)
+
+    # Wilder sums seeded from bars 1..window; the common 1/window factor cancels in the ratios
+    tr_s = _wilder_seeded(tr, window, seed_start=1)
+    pos_s = _wilder_seeded(pos, window, seed_start=1)
+    neg_s = _wilder_seeded(neg, window, seed_start=1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        di_plus = np.where(tr_s != 0, 100 * pos_s / tr_s, 0.0)
+        di_minus = np.where(tr_s != 0, 100 * neg_s / tr_s, 0.0)
+        di_sum = di_plus + di_minus
+        dx = np.where(di_sum != 0, 100 * np.abs(di_plus - di_minus) / di_sum, 0.0)
+    dx = np.where(np.isnan(tr_s), np.nan, dx)
+
+    result = _wilder_seeded(dx, window, seed_start=window)
+    result[..., :2 * window - 1] = 0.0
+    return result
+
+
+def _supertrend_1d(basic_upper, basic_lower, close, start, upper, lower, direction):
+    """Band/direction recursion of supertrend for one series; fills the output arrays in place."""
+    n = len(close)
+    if n <= start:
+        return
+    up, lo, trend = basic_upper[start], basic_lower[start], True
+    final_upper, final_lower, trends = [up], [lo], [True]
+    for i in range(start + 1, n):
+        prev_close = close[i - 1]
+        new_up = basic_upper[i] if (basic_upper[i] < up or prev_close > up) else up
+        new_lo = basic_lower[i] if (basic_lower[i] > lo or prev_close < lo) else lo
+        if close[i] > up:
+            trend = True
+        elif close[i] < lo:
+            trend = False
+        up, lo = new_up, new_lo
+        final_upper.append(up)
+        final_lower.append(lo)
+        trends.append(trend)
+    upper[start:] = final_upper
+    lower[start:] = final_lower
+    direction[start:] = trends
+
+
+def supertrend(high, low, close, period=10, multiplier=3.0, atr=None):
+    """
+    Supertrend with carried-forward final bands.
+
+    Returns a dict of arrays shaped like `close`:
+      direction   - True while the trend is up (True during the warm-up bars)
+      supertrend  - the active band (lower band in an uptrend, upper in a downtrend), NaN in warm-up
+      upper/lower - final (carried-forward) bands, NaN in warm-up
+    `atr` can be passed in to reuse an ATR that was already computed with the same window.
+    """
+    high, low, close = _as_float(high, low, close)
+    if atr is None:
+        atr = wilder_atr(high, low, close, period)
+
+    hl2 = (high + low) / 2
+    basic_upper = hl2 + multiplier * atr
+    basic_lower = hl2 - multiplier * atr
+
+    upper = np.full_like(close, np.nan)
+    lower = np.full_like(close, np.nan)
+    direction = np.ones(close.shape, dtype=bool)
+
+    start = period - 1  # first bar with a real ATR
+    n = close.shape[-1]
+    if n > start:
+        upper[..., start] = basic_upper[..., start]
+        lower[..., start] = basic_lower[..., start]
+
+    if close.ndim == 1:
+        # One series: a loop over Python floats avoids per-element NumPy dispatch
+        _supertrend_1d(basic_upper.tolist(), basic_lower.tolist(), close.tolist(), start, upper, lower, direction)
+        line = np.where(direction, lower, upper)
+        return {"direction": direction, "supertrend": line, "upper": upper, "lower": lower}
+
+    for i in range(start + 1, n):
+        prev_upper = upper[..., i - 1]
+        prev_lower = lower[..., i - 1]
+        prev_close = close[..., i - 1]
+
+        # A band only tightens, unless price closed through it on the previous bar
+        upper[..., i] = np.where((basic_upper[..., i] < prev_upper) | (prev_close > prev_upper),
+                                 basic_upper[..., i], prev_upper)
+        lower[..., i] = np.where((basic_lower[..., i] > prev_lower) | (prev_close < prev_lower),
+                                 basic_lower[..., i], prev_lower)
+
+        cur_close = close[..., i]
+        direction[..., i] = np.where(cur_close > prev_upper, True,
+                                     np.where(cur_close < prev_lower, False, direction[..., i - 1]))
+
+    line = np.where(direction, lower, upper)
+    return {"direction": direction, "supertrend": line, "upper": upper, "lower": lower}
@@ -0,0 +1,209 @@
+# modules/indicators/registry.py
+#
+# Indicator dependency graph. Every output column is produced by a small
+# function that asks an IndicatorContext for the intermediates it needs
+# (true range, ATR per window, EMA per span, directional movement, ...).
+# The context memoizes each intermediate, so shared series are computed once,
+# and only the columns that were asked for are computed at all.
+#
+# from modules.indicators.registry import compute_indicators
+# df = compute_indicators(price_df)                                      # every configured column
+# df = compute_indicators(price_df, columns=["rsi_14", "supertrend_7_dir"])  # just these
+
+import math
+
+import numpy as np
+import pandas as pd
+
+from modules.indicators import kernels
+
+# Config keys and defaults shared by every indicator entry point
+DEFAULT_CONFIG = {
+    "rsi": True, "rsi_period": 14,
+    "macd": True, "macd_fast": 12, "macd_slow": 26, "macd_signal": 9,
+    "bollinger_bands": True, "bb_window": 20, "bb_std": 2,
+    "atr": True, "atr_period": 14,
+    "adx": True, "adx_period": 14,
+    "supertrend": True, "supertrend_period": 7, "supertrend_multiplier": 3,
+}
+
+# An exponentially seeded average counts as converged once its seed weighs less than this
+CONVERGENCE_TOLERANCE = 0.01
+# Extra history on top of the slowest indicator's warm-up
+HISTORY_MARGIN = 0.1
+
+
+class IndicatorContext:
+    """OHLC arrays (time on the last axis) plus a memo of intermediates keyed by (name, params)."""
+
+    def __init__(self, high, low, close):
+        self.high = np.asarray(high, dtype="float64")
+        self.low = np.asarray(low, dtype="float64")
+        self.close = np.asarray(close, dtype="float64")
+        self.cache = {}
+
+    def get(self, name: str, *params):
+        key = (name,) + params
+        if key not in self.cache:
+            self.cache[key] = INTERMEDIATES[name](self, *params)
+        return self.cache[key]
+
+
+# --- Intermediates: fn(ctx, *params) ---
+
+INTERMEDIATES = {
+    "tr": lambda ctx: kernels.true_range(ctx.high, ctx.low, ctx.close),
+    "dm": lambda ctx: kernels.directional_movement(ctx.high, ctx.low),
+    "atr": lambda ctx, window: kernels.wilder_atr(ctx.high, ctx.low, ctx.close, window, tr=ctx.get("tr")),
+    "ema": lambda ctx, span: kernels.ema(ctx.close, span),
+    "rsi": lambda ctx, window: kernels.rsi(ctx.close, window),
+    "adx": lambda ctx, window: kernels.adx(ctx.high, ctx.low, ctx.close, window, tr=ctx.get("tr"), dm=ctx.get("dm")),
+    "macd": lambda ctx, fast, slow, signal: _macd(ctx, fast, slow, signal),
+    # Rolling mean/std per window are shared by every band width
+    "sma": lambda ctx, window: kernels._rolling(ctx.close, window, "mean"),
+    "rolling_std": lambda ctx, window: kernels._rolling(ctx.close, window, "std"),
+    "bollinger": lambda ctx, window, std: _bollinger(ctx, window, std),
+    "supertrend": lambda ctx, period, mult: kernels.supertrend(
+        ctx.high, ctx.low, ctx.close, period, mult, atr=ctx.get("atr", period)),
+}
+
+
+def _macd(ctx, fast, slow, signal):
+    line = ctx.get("ema", fast) - ctx.get("ema", slow)
+    return line, kernels.ema(line, signal)
+
+
+def _bollinger(ctx, window, std):
+    """Same arithmetic as kernels.bollinger: (upper, middle, lower)."""
+    middle, dev = ctx.get("sma", window), ctx.get("rolling_std", window)
+    return middle + std * dev, middle, middle - std * dev
+
+
+# --- Output columns: flag -> fn(config) -> {column: fn(ctx)} ---
+
+def _rsi_columns(c):
+    return {f"rsi_{c['rsi_period']}": lambda ctx: ctx.get("rsi", c["rsi_period"])}
+
+
+def _macd_columns(c):
+    params = (c["macd_fast"], c["macd_slow"], c["macd_signal"])
+    return {
+        "macd": lambda ctx: ctx.get("macd", *params)[0],
+        "macd_signal": lambda ctx: ctx.get("macd", *params)[1],
+    }
+
+
+def _bollinger_columns(c):
+    params = (c["bb_window"], c["bb_std"])
+    return {
+        "bb_upper": lambda ctx: ctx.get("bollinger", *params)[0],
+        "bb_lower": lambda ctx: ctx.get("bollinger", *params)[2],
+    }
+
+
+def _atr_columns(c):
+    return {f"atr_{c['atr_period']}": lambda ctx: ctx.get("atr", c["atr_period"])}
+
+
+def _adx_columns(c):
+    window = c["adx_period"]
+    return {f"adx_{window}": lambda ctx: ctx.get("adx", window)}
+
+
+def _supertrend_columns(c):
+    params = (c["supertrend_period"], c["supertrend_multiplier"])
+    return {
+        f"supertrend_{params[0]}": lambda ctx: ctx.get("supertrend", *params)["supertrend"],
+        f"supertrend_{params[0]}_dir": lambda ctx: ctx.get("supertrend", *params)["direction"],
+    }
+
+
+# Config flag -> column factory, in output column order
+INDICATORS = {
+    "rsi": _rsi_columns,
+    "macd": _macd_columns,
+    "bollinger_bands": _bollinger_columns,
+    "atr": _atr_columns,
+    "adx": _adx_columns,
+    "supertrend": _supertrend_columns,
+}
+
+
+def resolve_config(config: dict = None) -> dict:
+    return {**DEFAULT_CONFIG, **(config or {})}
+
+
+def available_columns(config: dict = None) -> dict:
+    """{column: (flag, fn(ctx))} for every indicator enabled in the config."""
+    c = resolve_config(config)
+    columns = {}
+    for flag, factory in INDICATORS.items():
+        if c.get(flag, True):
+            for name, fn in factory(c).items():
+                columns[name] = (flag, fn)
+    return columns
+
+
+def compute_indicator_arrays(high, low, close, config: dict = None, columns=None, context=None) -> dict:
+    """
+    {column: array} for the requested columns (all enabled ones by default).
+    Pass a shared IndicatorContext to reuse intermediates across calls on the same prices.
+    """
+    available = available_columns(config)
+    if columns is None:
+        wanted = list(available)
+    else:
+        unknown = [col for col in columns if col not in available]
+        if unknown:
+            raise ValueError(f"Unknown or disabled indicator columns {unknown}; available: {list(available)}")
+        wanted = list(columns)
+
+    ctx = context or IndicatorContext(high, low, close)
+    return {name: available[name][1](ctx) for name in wanted}
+
+
+def compute_indicators(df: pd.DataFrame, config: dict = None, columns=None) -> pd.DataFrame:
+    """
+    Copy of df with indicator columns added. `columns` limits the work to those outputs;
+    names that are already columns of df (e.g. "close") are ignored.
+    """
+    if columns is not None:
+        columns = [col for col in columns if col not in df.columns]
+    values = compute_indicator_arrays(df["high"].to_numpy(), df["low"].to_numpy(),
+                                      df["close"].to_numpy(), config, columns)
+    return df.assign(**values)
+
+
+# --- Warm-up: flag -> fn(config) -> bars before the values stop depending on where history starts ---
+
+def _decay_bars(alpha: float) -> int:
+    """Bars until an ewm(alpha) forgets its seed to within CONVERGENCE_TOLERANCE."""
+    return math.ceil(math.log(CONVERGENCE_TOLERANCE) / math.log(1 - alpha))
+
+
+def _macd_warmup(c):
+    slow = max(c["macd_fast"], c["macd_slow"])
+    return slow + _decay_bars(2 / (slow + 1)) + c["macd_signal"] + _decay_bars(2 / (c["macd_signal"] + 1))
+
+
+WARMUP = {
+    "rsi": lambda c: c["rsi_period"] + _decay_bars(1 / c["rsi_period"]),
+    "macd": _macd_warmup,
+    "bollinger_bands": lambda c: c["bb_window"],
+    "atr": lambda c: c["atr_period"] + _decay_bars(1 / c["atr_period"]),
+    "adx": lambda c: 2 * c["adx_period"] + _decay_bars(1 / c["adx_period"]),
+    # ATR warm-up plus one more period for the carried-forward bands to settle
+    "supertrend": lambda c: 2 * c["supertrend_period"] + _decay_bars(1 / c["supertrend_period"]),
+}
+
+
+def required_history_bars(config: dict = None, columns=None, output_bars: int = 1) -> int:
+    """
+    Bars of history needed so the last `output_bars` rows of the requested columns
+    (all enabled ones by default) are converged, including HISTORY_MARGIN.
+    """
+    c = resolve_config(config)
+    available = available_columns(c)
+    flags = {flag for name, (flag, _) in available.items() if columns is None or name in columns}
+    warmup = max((WARMUP[flag](c) for flag in flags), default=0)
+    return math.ceil(warmup * (1 + HISTORY_MARGIN)) + output_bars
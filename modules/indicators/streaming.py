@@ -0,0 +1,465 @@
+# modules/indicators/streaming.py
+#
+# Stateful indicator engine: seed it once from history, then each new bar is
+# folded in with O(1) work. Produces the same columns and values as
+# indicators.apply_all_indicators, and its state can be saved to / restored
+# from JSON between runs.
+#
+# from modules.indicators.streaming import StreamingIndicators
+# engine = StreamingIndicators.seed(history_df, config)
+# latest = engine.update({"date": ..., "high": ..., "low": ..., "close": ...})
+# engine.save(state_path("TCS"))
+#
+# update_symbol_state("TCS") does the load -> fold new stored bars -> save cycle.
+
+import json
+import math
+import os
+from collections import deque
+
+import pandas as pd
+
+from modules.data_fetcher.price_store import read_prices
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+STATE_DIR = os.path.join(PROJECT_ROOT, "data", "cache", "indicator_state")
+
+NAN = float("nan")
+
+# Bump when component state changes shape; saved states of another version are re-seeded
+STATE_VERSION = 2
+
+
+class _EMA:
+    """pandas ewm(adjust=False, min_periods=min_periods); NaN inputs are skipped."""
+
+    def __init__(self, alpha, min_periods):
+        self.alpha = alpha
+        self.min_periods = min_periods
+        self.value = NAN
+        self.count = 0
+
+    def update(self, x):
+        if not math.isnan(x):
+            self.value = x if self.count == 0 else self.alpha * x + (1 - self.alpha) * self.value
+            self.count += 1
+        return self.value if self.count >= self.min_periods else NAN
+
+    def snapshot(self):
+        return self.value, self.count
+
+    def restore(self, snap):
+        self.value, self.count = snap
+
+
+class _RSI:
+    """ta.momentum.RSIIndicator"""
+
+    def __init__(self, window):
+        self.up = _EMA(1 / window, window)
+        self.down = _EMA(1 / window, window)
+        self.prev_close = NAN
+
+    def update(self, close):
+        diff = close - self.prev_close  # NaN on the first bar, which ta turns into 0
+        self.prev_close = close
+        up = self.up.update(diff if diff > 0 else 0.0)
+        down = self.down.update(-diff if diff < 0 else 0.0)
+        if down == 0:
+            return 100.0
+        return 100 - 100 / (1 + up / down)
+
+    def snapshot(self):
+        return self.up.snapshot(), self.down.snapshot(), self.prev_close
+
+    def restore(self, snap):
+        up, down, self.prev_close = snap
+        self.up.restore(up)
+        self.down.restore(down)
+
+
+class _MACD:
+    """ta.trend.MACD (macd and signal lines)"""
+
+    def __init__(self, fast, slow, signal):
+        self.fast = _EMA(2 / (fast + 1), fast)
+        self.slow = _EMA(2 / (slow + 1), slow)
+        self.signal = _EMA(2 / (signal + 1), signal)
+
+    def update(self, close):
+        macd = self.fast.update(close) - self.slow.update(close)
+        return macd, self.signal.update(macd)
+
+    def snapshot(self):
+        return self.fast.snapshot(), self.slow.snapshot(), self.signal.snapshot()
+
+    def restore(self, snap):
+        for ema, part in zip((self.fast, self.slow, self.signal), snap):
+            ema.restore(part)
+
+
+class _Bollinger:
+    """
+    ta.volatility.BollingerBands (population std over the last `window` closes), from a running
+    sum and sum of squares. The sums are recomputed from the window every `window` bars so
+    floating-point drift cannot build up over long streams.
+    """
+
+    def __init__(self, window, std):
+        self.window = window
+        self.std = std
+        self.values = deque(maxlen=window)
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.since_resum = 0
+
+    def update(self, close):
+        if len(self.values) == self.window:
+            old = self.values[0]
+            self.total -= old
+            self.total_sq -= old * old
+        self.values.append(close)
+        self.since_resum += 1
+        if self.since_resum >= self.window:
+            self.total = math.fsum(self.values)
+            self.total_sq = math.fsum(v * v for v in self.values)
+            self.since_resum = 0
+        else:
+            self.total += close
+            self.total_sq += close * close
+        if len(self.values) < self.window:
+            return NAN, NAN
+        mean = self.total / self.window
+        dev = math.sqrt(max(self.total_sq / self.window - mean * mean, 0.0))
+        return mean + self.std * dev, mean - self.std * dev
+
+    def snapshot(self):
+        # The next update drops at most the oldest value, so that is all a restore needs back
+        evicted = self.values[0] if len(self.values) == self.window else None
+        return self.total, self.total_sq, self.since_resum, evicted
+
+    def restore(self, snap):
+        self.total, self.total_sq, self.since_resum, evicted = snap
+        self.values.pop()
+        if evicted is not None:
+            self.values.appendleft(evicted)
+
+
+def _true_range(high, low, prev_close):
+    if math.isnan(prev_close):
+        return high - low
+    return max(high - low, abs(high - prev_close), abs(low - prev_close))
+
+
+class _ATR:
+    """ta.volatility.AverageTrueRange: 0 during warm-up, mean TR at bar window-1, then Wilder smoothing."""
+
+    def __init__(self, window):
+        self.window = window
+        self.prev_close = NAN
+        self.seed_sum = 0.0
+        self.seed_count = 0
+        self.value = 0.0
+
+    def update(self, high, low, close):
+        tr = _true_range(high, low, self.prev_close)
+        self.prev_close = close
+        if self.seed_count < self.window:
+            self.seed_sum += tr
+            self.seed_count += 1
+            if self.seed_count == self.window:
+                self.value = self.seed_sum / self.window
+            return self.value
+        self.value = (self.value * (self.window - 1) + tr) / self.window
+        return self.value
+
+    def snapshot(self):
+        return self.prev_close, self.seed_sum, self.seed_count, self.value
+
+    def restore(self, snap):
+        self.prev_close, self.seed_sum, self.seed_count, self.value = snap
+
+
+class _ADX:
+    """
+    ta.trend.ADXIndicator: Wilder sums of TR, +DM and -DM seeded from bars 1..window,
+    DX from bar `window`, ADX = mean DX at bar 2*window-1 then Wilder smoothing; 0 before that.
+    """
+
+    def __init__(self, window):
+        self.window = window
+        self.bars = 0
+        self.prev_high = NAN
+        self.prev_low = NAN
+        self.prev_close = NAN
+        self.trs = 0.0
+        self.dip = 0.0
+        self.din = 0.0
+        self.dx_sum = 0.0
+        self.dx_count = 0
+        self.value = 0.0
+
+    def update(self, high, low, close):
+        bar = self.bars
+        self.bars += 1
+        if bar == 0:
+            self.prev_high, self.prev_low, self.prev_close = high, low, close
+            return 0.0
+
+        tr = max(high, self.prev_close) - min(low, self.prev_close)
+        up = high - self.prev_high
+        down = self.prev_low - low
+        pos = up if (up > down and up > 0) else 0.0
+        neg = down if (down > up and down > 0) else 0.0
+        self.prev_high, self.prev_low, self.prev_close = high, low, close
+
+        w = self.window
+        if bar <= w:
+            self.trs += tr
+            self.dip += pos
+            self.din += neg
+            if bar < w:
+                return 0.0
+        else:
+            self.trs = self.trs - self.trs / w + tr
+            self.dip = self.dip - self.dip / w + pos
+            self.din = self.din - self.din / w + neg
+
+        di_plus = 100 * self.dip / self.trs if self.trs != 0 else 0.0
+        di_minus = 100 * self.din / self.trs if self.trs != 0 else 0.0
+        di_sum = di_plus + di_minus
+        dx = 100 * abs(di_plus - di_minus) / di_sum if di_sum != 0 else 0.0
+
+        if self.dx_count < w:
+            self.dx_sum += dx
+            self.dx_count += 1
+            if self.dx_count == w:
+                self.value = self.dx_sum / w
+            return self.value
+        self.value = (self.value * (w - 1) + dx) / w
+        return self.value
+
+    def snapshot(self):
+        return (self.bars, self.prev_high, self.prev_low, self.prev_close,
+                self.trs, self.dip, self.din, self.dx_sum, self.dx_count, self.value)
+
+    def restore(self, snap):
+        (self.bars, self.prev_high, self.prev_low, self.prev_close,
+         self.trs, self.dip, self.din, self.dx_sum, self.dx_count, self.value) = snap
+
+
+class _Supertrend:
+    """Streaming form of kernels.supertrend"""
+
+    def __init__(self, period, multiplier):
+        self.period = period
+        self.multiplier = multiplier
+        self.atr = _ATR(period)
+        self.bars = 0
+        self.upper = NAN
+        self.lower = NAN
+        self.prev_close = NAN
+        self.direction = True
+
+    def update(self, high, low, close):
+        atr = self.atr.update(high, low, close)
+        bar = self.bars
+        self.bars += 1
+        start = self.period - 1
+
+        if bar >= start:
+            hl2 = (high + low) / 2
+            basic_upper = hl2 + self.multiplier * atr
+            basic_lower = hl2 - self.multiplier * atr
+            if bar == start:
+                upper, lower = basic_upper, basic_lower
+            else:
+                upper = basic_upper if (basic_upper < self.upper or self.prev_close > self.upper) else self.upper
+                lower = basic_lower if (basic_lower > self.lower or self.prev_close < self.lower) else self.lower
+                if close > self.upper:
+                    self.direction = True
+                elif close < self.lower:
+                    self.direction = False
+            self.upper, self.lower = upper, lower
+
+        self.prev_close = close
+        line = self.lower if self.direction else self.upper
+        return line, self.direction
+
+    def snapshot(self):
+        return self.atr.snapshot(), self.bars, self.upper, self.lower, self.prev_close, self.direction
+
+    def restore(self, snap):
+        atr, self.bars, self.upper, self.lower, self.prev_close, self.direction = snap
+        self.atr.restore(atr)
+
+
+_COMPONENTS = {
+    "_EMA": _EMA, "_RSI": _RSI, "_MACD": _MACD, "_Bollinger": _Bollinger,
+    "_ATR": _ATR, "_ADX": _ADX, "_Supertrend": _Supertrend,
+}
+
+
+def _dump(obj):
+    if type(obj).__name__ in _COMPONENTS:
+        return {"__type__": type(obj).__name__, **{k: _dump(v) for k, v in vars(obj).items()}}
+    if isinstance(obj, deque):
+        return {"__deque__": list(obj), "maxlen": obj.maxlen}
+    return obj
+
+
+def _restore(data):
+    if isinstance(data, dict) and "__type__" in data:
+        obj = _COMPONENTS[data["__type__"]].__new__(_COMPONENTS[data["__type__"]])
+        obj.__dict__.update({k: _restore(v) for k, v in data.items() if k != "__type__"})
+        return obj
+    if isinstance(data, dict) and "__deque__" in data:
+        return deque(data["__deque__"], maxlen=data["maxlen"])
+    return data
+
+
+class StreamingIndicators:
+    """Same config keys and defaults as indicators.apply_all_indicators."""
+
+    def __init__(self, config: dict = None):
+        self.config = dict(config or {})
+        c = self.config
+        self.rsi_period = c.get("rsi_period", 14)
+        self.atr_window = c.get("atr_period", 14)
+        self.adx_window = c.get("adx_period", 14)
+        self.st_window = c.get("supertrend_period", 7)
+
+        self.components = {}
+        if c.get("rsi", True):
+            self.components["rsi"] = _RSI(self.rsi_period)
+        if c.get("macd", True):
+            self.components["macd"] = _MACD(c.get("macd_fast", 12), c.get("macd_slow", 26), c.get("macd_signal", 9))
+        if c.get("bollinger_bands", True):
+            self.components["bb"] = _Bollinger(c.get("bb_window", 20), c.get("bb_std", 2))
+        if c.get("atr", True):
+            self.components["atr"] = _ATR(self.atr_window)
+        if c.get("adx", True):
+            self.components["adx"] = _ADX(self.adx_window)
+        if c.get("supertrend", True):
+            self.components["supertrend"] = _Supertrend(self.st_window, c.get("supertrend_multiplier", 3))
+
+        self.last_date = None
+        self.last_values = {}
+        # Component snapshots from before the last bar, so a still-forming bar can be replaced
+        self._before_last = None
+
+    @classmethod
+    def seed(cls, df: pd.DataFrame, config: dict = None) -> "StreamingIndicators":
+        """Build an engine from history (a frame with date/high/low/close columns)."""
+        engine = cls(config)
+        rows = list(df[["date", "high", "low", "close"]].itertuples(index=False))
+        # Only the final bar can still be revised, so only it needs a snapshot
+        for i, row in enumerate(rows):
+            engine._fold(row._asdict(), snapshot=i == len(rows) - 1)
+        return engine
+
+    def _apply(self, high, low, close) -> dict:
+        values = {}
+        comps = self.components
+        if "rsi" in comps:
+            values[f"rsi_{self.rsi_period}"] = comps["rsi"].update(close)
+        if "macd" in comps:
+            values["macd"], values["macd_signal"] = comps["macd"].update(close)
+        if "bb" in comps:
+            values["bb_upper"], values["bb_lower"] = comps["bb"].update(close)
+        if "atr" in comps:
+            values[f"atr_{self.atr_window}"] = comps["atr"].update(high, low, close)
+        if "adx" in comps:
+            values[f"adx_{self.adx_window}"] = comps["adx"].update(high, low, close)
+        if "supertrend" in comps:
+            line, direction = comps["supertrend"].update(high, low, close)
+            values[f"supertrend_{self.st_window}"] = line
+            values[f"supertrend_{self.st_window}_dir"] = direction
+        return values
+
+    def update(self, bar) -> dict:
+        """
+        Fold one bar (mapping with high/low/close and optionally date) into the state and
+        return the latest indicator values. A bar with the same date as the previous one
+        replaces it; older bars are ignored.
+        """
+        return self._fold(bar, snapshot=True)
+
+    def _fold(self, bar, snapshot: bool) -> dict:
+        date = bar.get("date")
+        if date is not None and self.last_date is not None:
+            date = pd.Timestamp(date)
+            if date < self.last_date:
+                return self.last_values
+            if date == self.last_date and self._before_last is not None:
+                for name, comp in self.components.items():
+                    comp.restore(self._before_last[name])
+
+        self._before_last = {name: comp.snapshot() for name, comp in self.components.items()} if snapshot else None
+        self.last_values = self._apply(float(bar["high"]), float(bar["low"]), float(bar["close"]))
+        if date is not None:
+            self.last_date = pd.Timestamp(date)
+        return self.last_values
+
+    def state_dict(self) -> dict:
+        return {
+            "config": self.config,
+            "last_date": self.last_date.isoformat() if self.last_date is not None else None,
+            "last_values": self.last_values,
+            "version": STATE_VERSION,
+            "components": {name: _dump(comp) for name, comp in self.components.items()},
+            "before_last": self._before_last,
+        }
+
+    @classmethod
+    def from_state(cls, state: dict) -> "StreamingIndicators":
+        if state.get("version") != STATE_VERSION:
+            raise ValueError(f"Unsupported indicator state version: {state.get('version')}")
+        engine = cls(state["config"])
+        engine.components = {name: _restore(comp) for name, comp in state["components"].items()}
+        engine._before_last = state.get("before_last")
+        engine.last_date = pd.Timestamp(state["last_date"]) if state["last_date"] else None
+        engine.last_values = state["last_values"]
+        return engine
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.state_dict(), f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "StreamingIndicators":
+        with open(path) as f:
+            return cls.from_state(json.load(f))
+
+
+def state_path(symbol: str, interval: str = "1d") -> str:
+    return os.path.join(STATE_DIR, interval, f"{symbol.upper()}.json")
+
+
+def update_symbol_state(symbol: str, interval: str = "1d", config: dict = None) -> dict:
+    """
+    Bring a symbol's persisted engine up to date with the price store and return the latest values.
+    Only bars from the last processed date onwards are folded in; the engine is re-seeded from
+    the full stored history when no state exists or the config changed.
+    """
+    path = state_path(symbol, interval)
+    engine = None
+    if os.path.exists(path):
+        try:
+            engine = StreamingIndicators.load(path)
+        except ValueError as e:
+            print(f"[streaming] Re-seeding {symbol}: {e}")
+        if engine is not None and engine.config != dict(config or {}):
+            engine = None
+
+    if engine is None:
+        engine = StreamingIndicators.seed(read_prices(symbol, interval), config)
+    else:
+        for bar in read_prices(symbol, interval, start=engine.last_date).to_dict("records"):
+            engine.update(bar)
+
+    engine.save(path)
+    return engine.last_values
@@ -0,0 +1,109 @@
+# modules/indicators/universe.py
+#
+# Universe-level indicator computation: every symbol's OHLC is aligned into
+# (symbols x dates) NumPy matrices and each indicator is computed for all
+# symbols at once with the kernels in modules/indicators/kernels.py.
+#
+# from modules.indicators.universe import compute_universe_indicators
+# long_df = compute_universe_indicators(["TCS", "INFY", "RELIANCE"])
+# panel, matrices = compute_universe_indicators(symbols, as_long=False)
+
+import numpy as np
+import pandas as pd
+
+from modules.data_fetcher.price_store import read_prices
+from modules.indicators.registry import compute_indicator_arrays
+
+PANEL_FIELDS = ["open", "high", "low", "close", "volume"]
+
+
+def build_panel(prices: pd.DataFrame) -> dict:
+    """
+    Align a long price frame (date/symbol/open/high/low/close/volume) into matrices.
+    Returns {"symbols": [...], "dates": DatetimeIndex, "<field>": (symbols x dates) float arrays};
+    missing bars are NaN.
+    """
+    prices = prices.drop_duplicates(subset=["symbol", "date"], keep="last")
+    panel = {}
+    for field in PANEL_FIELDS:
+        wide = prices.pivot(index="symbol", columns="date", values=field).sort_index(axis=1)
+        if "symbols" not in panel:
+            panel["symbols"] = wide.index.tolist()
+            panel["dates"] = pd.DatetimeIndex(wide.columns)
+        panel[field] = wide.to_numpy(dtype="float64")
+    return panel
+
+
+def _pack(valid: np.ndarray):
+    """Column order that moves each row's valid bars to the front, keeping their order."""
+    return np.argsort(~valid, axis=1, kind="stable")
+
+
+def _unpack(packed: np.ndarray, order: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    out = np.empty_like(packed)
+    np.put_along_axis(out, order, packed, axis=1)
+    if out.dtype == bool:
+        out[~valid] = False
+    else:
+        out[~valid] = np.nan
+    return out
+
+
+def compute_panel_indicators(panel: dict, config: dict = None) -> dict:
+    """
+    Indicator matrices (symbols x dates) for a panel from build_panel.
+    Each symbol's bars are packed to the left before computing, so symbols that
+    start later or have gaps get exactly the values a per-symbol computation would.
+    Cells without a bar are NaN (False for the *_dir columns).
+    """
+    valid = ~(np.isnan(panel["close"]) | np.isnan(panel["high"]) | np.isnan(panel["low"]))
+    order = _pack(valid)
+    high, low, close = (np.take_along_axis(panel[f], order, axis=1) for f in ("high", "low", "close"))
+    packed = compute_indicator_arrays(high, low, close, config)
+    return {name: _unpack(values, order, valid) for name, values in packed.items()}
+
+
+def panel_to_long(panel: dict, indicators: dict) -> pd.DataFrame:
+    """Tidy frame with one row per (symbol, date) bar: date, symbol, OHLCV and indicator columns."""
+    rows, cols = np.nonzero(~np.isnan(panel["close"]))
+    data = {
+        "date": panel["dates"][cols],
+        "symbol": np.asarray(panel["symbols"], dtype=object)[rows],
+    }
+    for field in PANEL_FIELDS:
+        data[field] = panel[field][rows, cols]
+    for name, values in indicators.items():
+        data[name] = values[rows, cols]
+    return pd.DataFrame(data).sort_values(["symbol", "date"], kind="stable").reset_index(drop=True)
+
+
+def load_universe_prices(symbols, interval: str = "1d") -> pd.DataFrame:
+    """Stored bars for many symbols from the local price store (no network)."""
+    frames = [read_prices(symbol, interval) for symbol in symbols]
+    frames = [df for df in frames if not df.empty]
+    if not frames:
+        return pd.DataFrame(columns=["date", "symbol"] + PANEL_FIELDS)
+    return pd.concat(frames, ignore_index=True)
+
+
+def compute_universe_indicators(symbols_or_prices, config: dict = None, interval: str = "1d", as_long: bool = True):
+    """
+    Compute indicators for a whole universe in one vectorized pass.
+    Accepts a list of symbols (read from the price store) or a long price frame.
+    Returns a tidy long frame, or (panel, matrices) with as_long=False.
+    """
+    if isinstance(symbols_or_prices, pd.DataFrame):
+        prices = symbols_or_prices
+    else:
+        prices = load_universe_prices(symbols_or_prices, interval)
+    if prices.empty:
+        print("[universe] No price data available")
+        return pd.DataFrame() if as_long else ({}, {})
+
+    panel = build_panel(prices)
+    matrices = compute_panel_indicators(panel, config)
+    print(f"[universe] Computed {len(matrices)} indicators for {len(panel['symbols'])} symbols "
+          f"x {len(panel['dates'])} dates")
+    if as_long:
+        return panel_to_long(panel, matrices)
+    return panel, matrices
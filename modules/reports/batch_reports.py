@@ -0,0 +1,153 @@
+# modules/reports/batch_reports.py
+#
+# Batch report mode: resolve a universe, load every symbol's company and
+# indicator rows in one pass (ReportData), render the reports across a process
+# pool and write them under data/reports/YYYY-MM-DD/ as <SYMBOL>.txt plus a
+# summary.json with the signal and verdict of every symbol.
+#
+# from modules.reports.batch_reports import generate_batch_reports
+# summary = generate_batch_reports("NIFTY50")
+#
+# python -m modules.reports.batch_reports NIFTY50
+# python -m modules.reports.batch_reports TCS,INFY --workers 2 --refresh
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from modules.reports.generate_stock_report import render_report
+from modules.reports.report_data import ReportData
+from modules.reports.scoring import score_signals
+from modules.screener.screener import resolve_universe
+from modules.utils.helpers import atomic_write_text
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+REPORTS_DIR = os.path.join(PROJECT_ROOT, "data", "reports")
+SUMMARY_FILE = "summary.json"
+
+
+def report_dir(day=None) -> str:
+    day = pd.Timestamp(day or pd.Timestamp.now()).strftime("%Y-%m-%d")
+    return os.path.join(REPORTS_DIR, day)
+
+
+def _render_chunk(task):
+    """Render and write one chunk of ReportInputs; runs in a worker process."""
+    inputs_list, out_dir = task
+    results = []
+    for inputs in inputs_list:
+        try:
+            # render_report prints debug output for every symbol
+            with contextlib.redirect_stdout(io.StringIO()):
+                text = render_report(inputs)
+            path = atomic_write_text(text, os.path.join(out_dir, f"{inputs.symbol}.txt"))
+            results.append((inputs.symbol, path, None))
+        except Exception as e:
+            results.append((inputs.symbol, None, str(e)))
+    return results
+
+
+def _render_all(inputs_list, out_dir, workers):
+    if not inputs_list:
+        return []
+    per_task = max(1, math.ceil(len(inputs_list) / (workers * 4)))
+    tasks = [(inputs_list[i:i + per_task], out_dir) for i in range(0, len(inputs_list), per_task)]
+    if workers == 1 or len(tasks) == 1:
+        return [result for task in tasks for result in _render_chunk(task)]
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+        return [result for chunk in pool.map(_render_chunk, tasks) for result in chunk]
+
+
+def _json_value(value):
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    return value.item() if hasattr(value, "item") else value
+
+
+def _signals(data: ReportData, symbols) -> dict:
+    """symbol -> signal / verdict / score fields from the vectorized report rules."""
+    rows = data.tech.reindex([s for s in symbols if s in data.tech.index])
+    if rows.empty:
+        return {}
+    scored = score_signals(rows.reset_index(drop=True))
+    fields = ["date", "close", "signal_score", "signal", "verdict_label", "confidence", "verdict"]
+    return {
+        record["symbol"]: {k: _json_value(record.get(k)) for k in fields}
+        for record in scored.to_dict("records")
+    }
+
+
+def generate_batch_reports(universe="NIFTY50", company_csv_path=None, tech_csv_path=None, out_dir=None,
+                           workers: int = None, interval: str = "1d") -> dict:
+    """
+    Write a report per symbol of the universe (index name, "TCS,INFY" or a list) and a summary.json.
+    Returns the summary dict.
+    """
+    started = time.perf_counter()
+    symbols = resolve_universe(universe, interval)
+    out_dir = out_dir or report_dir()
+    workers = workers or os.cpu_count() or 1
+
+    data = ReportData(company_csv_path, tech_csv_path, interval).load(symbols)
+    inputs_list, missing = [], []
+    for symbol in symbols:
+        inputs = data.get(symbol)
+        if inputs is None:
+            missing.append(symbol)
+        else:
+            inputs_list.append(inputs)
+
+    print(f"[batch_reports] Rendering {len(inputs_list)} reports on {workers} workers")
+    results = _render_all(inputs_list, out_dir, workers)
+    signals = _signals(data, [inputs.symbol for inputs in inputs_list])
+
+    reports = {}
+    for symbol, path, error in results:
+        entry = {"status": "ok" if error is None else "error", "file": os.path.basename(path) if path else None}
+        if error:
+            entry["error"] = error
+        reports[symbol] = {**entry, **signals.get(symbol, {})}
+    for symbol in missing:
+        reports[symbol] = {"status": "no_data"}
+
+    summary = {
+        "universe": universe if isinstance(universe, str) else ",".join(symbols),
+        "interval": interval,
+        "generated_at": pd.Timestamp.now().isoformat(timespec="seconds"),
+        "seconds": round(time.perf_counter() - started, 3),
+        "counts": {status: sum(r["status"] == status for r in reports.values()) for status in ("ok", "error", "no_data")},
+        "reports": {symbol: reports[symbol] for symbol in symbols if symbol in reports},
+    }
+    atomic_write_text(json.dumps(summary, indent=2, ensure_ascii=False), os.path.join(out_dir, SUMMARY_FILE))
+    print(f"[batch_reports] {summary['counts']} in {summary['seconds']}s -> {out_dir}")
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a report for every symbol of a universe")
+    parser.add_argument("universe", nargs="?", default="NIFTY50", help="index name or TCS,INFY")
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--out", help="output directory (default data/reports/YYYY-MM-DD)")
+    parser.add_argument("--interval", default="1d")
+    parser.add_argument("--refresh", action="store_true", help="update prices, indicators and company info first")
+    args = parser.parse_args()
+
+    if args.refresh:
+        from modules.data_fetcher.fetch_company_info import save_company_info
+        from modules.screener.screener import refresh_universe
+        refresh_universe(args.universe, interval=args.interval)
+        save_company_info(resolve_universe(args.universe, args.interval))
+    generate_batch_reports(args.universe, out_dir=args.out, workers=args.workers, interval=args.interval)
+
+
+if __name__ == "__main__":
+    main()
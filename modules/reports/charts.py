@@ -0,0 +1,232 @@
+# modules/reports/charts.py
+#
+# Price + indicator charts for Telegram reports: close with Bollinger bands and
+# Supertrend, an RSI panel and a MACD panel, drawn from the indicator store.
+# Rendering runs with matplotlib's headless Agg canvas in a small dedicated
+# process pool, so the bot's event loop never waits on it. PNGs are cached
+# under data/cache/charts/ per (symbol, last bar, chart spec); a hot symbol is
+# drawn once per bar and repeat requests just read the cached bytes.
+#
+# from modules.reports.charts import chart_png, chart_png_async
+# png = chart_png("TCS")                  # bytes or None
+# png = await chart_png_async("TCS")      # same, from a coroutine
+#
+# python -m modules.reports.charts TCS --bars 250
+
+import argparse
+import asyncio
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import re
+import shutil
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from modules.data_fetcher import price_store
+from modules.indicators.indicator_store import indicator_columns, read_indicators
+from modules.utils.helpers import path_lock
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+CACHE_DIR = os.path.join(PROJECT_ROOT, "data", "cache", "charts")
+
+CHART_WORKERS = 2
+DEFAULT_SPEC = {
+    "bars": 120,
+    "rsi": True,
+    "macd": True,
+    "width": 10.0,
+    "height": 8.0,
+    "dpi": 100,
+}
+
+RSI_COLUMN = re.compile(r"^rsi_\d+$")
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def resolve_spec(spec: dict = None) -> dict:
+    unknown = set(spec or {}) - set(DEFAULT_SPEC)
+    if unknown:
+        raise ValueError(f"Unknown chart options: {sorted(unknown)}")
+    return {**DEFAULT_SPEC, **(spec or {})}
+
+
+def spec_hash(spec: dict = None, rsi_column: str = None) -> str:
+    """Hash of the spec plus the RSI column drawn, so charts of different RSI periods never share a file."""
+    payload = json.dumps({**resolve_spec(spec), "rsi_column": rsi_column}, sort_keys=True)
+    return hashlib.sha1(payload.encode()).hexdigest()[:12]
+
+
+def _last_bar(symbol: str, interval: str):
+    df = read_indicators(symbol, interval, columns=["date"], last_n=1)
+    return None if df.empty else pd.Timestamp(df["date"].iloc[-1])
+
+
+def chart_path(symbol: str, interval: str = "1d", spec: dict = None):
+    """Cache file for the symbol's current last bar and this spec, or None without stored indicators."""
+    bar = _last_bar(symbol, interval)
+    if bar is None:
+        return None
+    digest = spec_hash(spec, _rsi_column(indicator_columns(symbol, interval)))
+    return os.path.join(CACHE_DIR, interval, symbol.upper(), f"{bar:%Y%m%d%H%M}_{digest}.png")
+
+
+# --- Rendering (worker process) ---
+
+def _rsi_column(columns):
+    return next((c for c in columns if RSI_COLUMN.match(c)), None)
+
+
+def _supertrend_columns(columns):
+    direction = next((c for c in columns if c.startswith("supertrend_") and c.endswith("_dir")), None)
+    return (direction[:-len("_dir")], direction) if direction else (None, None)
+
+
+def render_chart(df: pd.DataFrame, symbol: str, spec: dict = None) -> bytes:
+    """PNG bytes for an indicator frame (date, close, bb_*, supertrend_*, rsi_*, macd, macd_signal)."""
+    # Imported here so only the chart workers pay for matplotlib; the Figure/Agg canvas API
+    # needs no display and no pyplot global state
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    spec = resolve_spec(spec)
+    df = df.sort_values("date").tail(spec["bars"])
+    dates = pd.to_datetime(df["date"]).to_numpy()
+    close = df["close"].to_numpy(dtype="float64")
+
+    panels = ["price"] + [name for name in ("rsi", "macd") if spec[name]]
+    fig = Figure(figsize=(spec["width"], spec["height"]), dpi=spec["dpi"])
+    FigureCanvasAgg(fig)
+    axes = fig.subplots(len(panels), 1, sharex=True, squeeze=False,
+                        gridspec_kw={"height_ratios": [3] + [1] * (len(panels) - 1)})[:, 0]
+
+    ax = axes[0]
+    ax.plot(dates, close, color="black", linewidth=1.2, label="Close")
+    if {"bb_upper", "bb_lower"} <= set(df.columns):
+        upper, lower = df["bb_upper"].to_numpy(dtype="float64"), df["bb_lower"].to_numpy(dtype="float64")
+        ax.plot(dates, upper, color="tab:blue", linewidth=0.8, label="BB")
+        ax.plot(dates, lower, color="tab:blue", linewidth=0.8)
+        ax.fill_between(dates, lower, upper, color="tab:blue", alpha=0.08)
+    line_col, dir_col = _supertrend_columns(df.columns)
+    if line_col in df.columns:
+        line = df[line_col].to_numpy(dtype="float64")
+        up = df[dir_col].astype("boolean").fillna(False).to_numpy(dtype=bool)
+        ax.plot(dates, np.where(up, line, np.nan), color="tab:green", linewidth=1, label="Supertrend")
+        ax.plot(dates, np.where(~up, line, np.nan), color="tab:red", linewidth=1)
+    ax.set_title(f"{symbol} – last close {close[-1]:,.2f}" if len(close) else symbol)
+    ax.legend(loc="upper left", fontsize=8)
+
+    rsi_col = _rsi_column(df.columns)
+    for ax, panel in zip(axes[1:], panels[1:]):
+        if panel == "rsi" and rsi_col:
+            ax.plot(dates, df[rsi_col].to_numpy(dtype="float64"), color="tab:purple", linewidth=1)
+            ax.axhline(70, color="tab:red", linewidth=0.6, linestyle="--")
+            ax.axhline(30, color="tab:green", linewidth=0.6, linestyle="--")
+            ax.set_ylim(0, 100)
+            ax.set_ylabel(f"RSI ({rsi_col[len('rsi_'):]})")
+        elif panel == "macd" and {"macd", "macd_signal"} <= set(df.columns):
+            macd, signal = df["macd"].to_numpy(dtype="float64"), df["macd_signal"].to_numpy(dtype="float64")
+            hist = macd - signal
+            ax.bar(dates, hist, color=np.where(hist >= 0, "tab:green", "tab:red"), alpha=0.5)
+            ax.plot(dates, macd, color="tab:blue", linewidth=1, label="MACD")
+            ax.plot(dates, signal, color="tab:orange", linewidth=1, label="Signal")
+            ax.set_ylabel("MACD")
+            ax.legend(loc="upper left", fontsize=8)
+    for ax in axes:
+        ax.grid(alpha=0.3)
+    fig.autofmt_xdate()
+    fig.tight_layout()
+
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png")
+    return buf.getvalue()
+
+
+def _render_to_file(task):
+    symbol, interval, spec, path = task
+    df = read_indicators(symbol, interval, last_n=resolve_spec(spec)["bars"])
+    if df.empty:
+        return None
+    png = render_chart(df, symbol, spec)
+    folder = os.path.dirname(path)
+    os.makedirs(folder, exist_ok=True)
+    # Charts of older bars are never served again
+    bar = os.path.basename(path).split("_")[0]
+    for name in os.listdir(folder):
+        if not name.startswith(bar):
+            os.remove(os.path.join(folder, name))
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(png)
+    os.replace(tmp_path, path)
+    return path
+
+
+# --- Cached access ---
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: forking a process that runs the bot's threads can copy held locks
+            _pool = ProcessPoolExecutor(max_workers=CHART_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def _read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def chart_png(symbol: str, interval: str = "1d", spec: dict = None):
+    """Cached chart PNG bytes, rendering in the chart pool on a miss. None without stored indicators."""
+    symbol = symbol.upper()
+    path = chart_path(symbol, interval, spec)
+    if path is None:
+        return None
+    with path_lock(path):
+        if not os.path.exists(path):
+            try:
+                path = _get_pool().submit(_render_to_file, (symbol, interval, spec, path)).result()
+            except Exception as e:
+                print(f"[charts] Rendering failed for {symbol}: {e}")
+                return None
+        return _read(path) if path else None
+
+
+async def chart_png_async(symbol: str, interval: str = "1d", spec: dict = None):
+    """chart_png for coroutines: cache lookups run in a thread, rendering in the chart pool."""
+    return await asyncio.to_thread(chart_png, symbol, interval, spec)
+
+
+def invalidate(symbol: str, interval: str = None):
+    intervals = [interval] if interval else (os.listdir(CACHE_DIR) if os.path.isdir(CACHE_DIR) else [])
+    for iv in intervals:
+        shutil.rmtree(os.path.join(CACHE_DIR, iv, symbol.upper()), ignore_errors=True)
+
+
+# The forming bar changes values without changing its date
+price_store.register_update_listener(lambda symbol, interval: invalidate(symbol, interval))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render (or fetch the cached) report chart for a symbol")
+    parser.add_argument("symbol")
+    parser.add_argument("--interval", default="1d")
+    parser.add_argument("--bars", type=int, default=DEFAULT_SPEC["bars"])
+    args = parser.parse_args()
+
+    png = chart_png(args.symbol, args.interval, {"bars": args.bars})
+    path = chart_path(args.symbol, args.interval, {"bars": args.bars})
+    print(f"[charts] {len(png)} bytes -> {path}" if png else f"[charts] No stored indicators for {args.symbol}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,6 @@
 from modules.utils.telegram_sender import send_message
+from modules.reports.report_cache import cached_report
+from modules.reports.report_data import ReportData, ReportInputs
 import os
 from dotenv import load_dotenv
 import numpy as np
@@ -310,62 +312,22 @@ def extract_float(row, key):
         return None
 
 
-def generate_report(symbol, company_csv_path=None, tech_csv_path=None):
+def generate_report(symbol, company_csv_path=None, tech_csv_path=None, data: ReportData = None):
     """
-    Generate formatted report string for a given stock symbol
+    Generate formatted report string for a given stock symbol.
+    Pass a loaded ReportData to reuse its tables across symbols.
     """
-    base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
-
-    # Set default paths
-    if not company_csv_path:
-        company_csv_path = os.path.join(base_dir, "data", "processed", "company_info.csv")
-    if not tech_csv_path:
-        tech_csv_path = os.path.join(base_dir, "data", "processed", "technical_indicators.csv")
-
-    if not os.path.exists(company_csv_path) or not os.path.exists(tech_csv_path):
-        print(f"Missing CSVs. Ensure both company_info.csv and technical_indicators.csv are present.")
-        return None
-
-    # Load data
-    company_df = pd.read_csv(company_csv_path)
-    tech_df = pd.read_csv(tech_csv_path)
-
-    # Filter for the symbol (case-insensitive)
-    company_info = company_df[company_df["symbol"].str.upper() == symbol.upper()]
-    tech_info = tech_df[tech_df["symbol"].str.upper() == symbol.upper()]
-
-    if company_info.empty or tech_info.empty:
+    data = data or ReportData(company_csv_path, tech_csv_path)
+    inputs = data.get(symbol)
+    if inputs is None:
         return f"No data found for symbol: {symbol}"
+    return render_report(inputs)
 
-    latest_tech = tech_info.sort_values("date").iloc[-1]  # last row for most recent indicators
-
-    # Extract indicators
-    rsi = latest_tech.get("rsi_14", "N/A")
-    macd = latest_tech.get("macd", "N/A")
-    macd_signal = latest_tech.get("macd_signal", "N/A")
-    bb_upper = latest_tech.get("bb_upper", "N/A")
-    bb_lower = latest_tech.get("bb_lower", "N/A")
-    close_price = latest_tech.get("close", "N/A")
 
-    # Read both CSVs
-    comp_df = pd.read_csv(company_csv_path)
-    tech_df = pd.read_csv(tech_csv_path)
+def render_report(inputs: ReportInputs) -> str:
+    """Report text for one symbol's inputs; no I/O."""
+    symbol, comp_row, tech_row = inputs.symbol, inputs.company, inputs.tech
 
-    comp_df.columns = [col.lower() for col in comp_df.columns]
-    tech_df.columns = [col.lower() for col in tech_df.columns]
-
-    comp_row = comp_df[comp_df["symbol"].str.upper() == symbol.upper()]
-    tech_row = tech_df[tech_df["symbol"].str.upper() == symbol.upper()]
-
-    if comp_row.empty:
-        print(f"[WARN] No company info found for symbol: {symbol}")
-        return None
-    if tech_row.empty:
-        print(f"[WARN] No technical data found for symbol: {symbol}")
-        return None
-
-    comp_row = comp_row.iloc[0]
-    tech_row = tech_row.sort_values("date").iloc[-1]
     print(f"[DEBUG] Loaded company info for: {symbol}")
     print(f"[DEBUG] currentPrice: {comp_row.get('currentprice')} | type: {type(comp_row.get('currentprice'))}")
     print(f"[DEBUG] marketCap: {comp_row.get('marketCap')}")
@@ -493,13 +455,23 @@ Source: Yahoo Finance
 
 
 def generate_reports_for_symbols(symbols, company_csv_path=None, tech_csv_path=None, send_to_telegram=False,
-                                 chat_id=None):
+                                 chat_id=None, use_cache=False):
     reports = []
+    data = ReportData(company_csv_path, tech_csv_path)
+    # The report cache is keyed on the stores, so legacy CSV inputs always render
+    use_cache = use_cache and not (company_csv_path or tech_csv_path)
+    if not use_cache:
+        # Load every source once for the whole batch
+        data.load(symbols)
     for symbol in symbols:
         print(f"Generating report for: {symbol}")
-        report = generate_report(symbol, company_csv_path, tech_csv_path)
+        if use_cache:
+            report = cached_report(symbol, render=lambda s: generate_report(s, data=data))
+        else:
+            report = generate_report(symbol, data=data)
         if report:
             reports.append(report)
             if send_to_telegram and chat_id:
+                # Queued; delivered by the outbound sender thread without blocking the batch
                 send_message(chat_id, report)
     return reports
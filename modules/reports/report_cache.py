@@ -0,0 +1,145 @@
+# modules/reports/report_cache.py
+#
+# Rendered report text keyed by symbol plus the version stamps of its inputs:
+# the last stored indicator bar, a digest of the stored fundamentals and
+# SCORING_VERSION. A repeat /stock request with unchanged inputs is served
+# without rendering. Two tiers: an in-process LRU and text files under
+# data/cache/reports/ that survive bot restarts. Entries for a symbol are also
+# dropped whenever the price store rewrites its bars (the forming daily bar
+# changes values without changing its date).
+#
+# from modules.reports.report_cache import cached_report
+# text = cached_report("INFY", render=generate_report)
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from modules.data_fetcher import price_store
+from modules.data_fetcher.company_store import get_company_info
+from modules.indicators.indicator_store import read_indicators
+from modules.reports.scoring import SCORING_VERSION
+from modules.utils.helpers import atomic_write_text, path_lock
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+CACHE_DIR = os.path.join(PROJECT_ROOT, "data", "cache", "reports")
+
+MEMORY_ENTRIES = 256
+PERSIST = True
+
+_memory = OrderedDict()
+_lock = threading.Lock()
+
+
+def last_bar(symbol: str, interval: str = "1d"):
+    """Date of the newest stored indicator row (reads one column of the last row group)."""
+    df = read_indicators(symbol, interval, columns=["date"], last_n=1)
+    return None if df is None or df.empty else pd.Timestamp(df["date"].iloc[-1])
+
+
+def fundamentals_stamp(symbol: str):
+    """
+    Digest of the company_store row the report renders from (its update time is left out,
+    since every upsert bumps it even when nothing changed). Keying on the store itself means
+    a fundamentals cache refresh that has not reached the store yet cannot relabel an old
+    report as current.
+    """
+    info = get_company_info(symbol)
+    if not info:
+        return None
+    info = {k: v for k, v in info.items() if k != "updatedAt"}
+    return hashlib.sha1(json.dumps(info, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+
+def make_key(symbol: str, interval: str = "1d"):
+    """(SYMBOL, interval, last bar, fundamentals digest, SCORING_VERSION), or None while an input is missing."""
+    bar, stamp = last_bar(symbol, interval), fundamentals_stamp(symbol)
+    if bar is None or stamp is None:
+        return None
+    return symbol.upper(), interval, f"{bar:%Y%m%d%H%M}", stamp, SCORING_VERSION
+
+
+def _disk_path(key: tuple) -> str:
+    symbol, interval = key[:2]
+    digest = hashlib.sha1(json.dumps(key[2:]).encode()).hexdigest()[:12]
+    return os.path.join(CACHE_DIR, interval, symbol, f"{key[2]}_{digest}.txt")
+
+
+def get(key: tuple):
+    with _lock:
+        if key in _memory:
+            _memory.move_to_end(key)
+            return _memory[key]
+
+    path = _disk_path(key)
+    if not PERSIST or not os.path.exists(path):
+        return None
+    try:
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+    except Exception as e:
+        print(f"[report_cache] Ignoring unreadable cache file {path}: {e}")
+        return None
+    _remember(key, text)
+    return text
+
+
+def put(key: tuple, text: str):
+    _remember(key, text)
+    if PERSIST:
+        try:
+            # Older versions of this symbol's report are dead weight once a new key is written
+            shutil.rmtree(os.path.dirname(_disk_path(key)), ignore_errors=True)
+            atomic_write_text(text, _disk_path(key))
+        except Exception as e:
+            print(f"[report_cache] Could not persist {key}: {e}")
+
+
+def _remember(key, text):
+    with _lock:
+        _memory[key] = text
+        _memory.move_to_end(key)
+        while len(_memory) > MEMORY_ENTRIES:
+            _memory.popitem(last=False)
+
+
+def invalidate(symbol: str, interval: str = None):
+    """Drop every cached report for a symbol (optionally only one interval), in memory and on disk."""
+    symbol = symbol.upper()
+    with _lock:
+        for key in [k for k in _memory if k[0] == symbol and (interval is None or k[1] == interval)]:
+            del _memory[key]
+
+    intervals = [interval] if interval else (os.listdir(CACHE_DIR) if os.path.isdir(CACHE_DIR) else [])
+    for iv in intervals:
+        shutil.rmtree(os.path.join(CACHE_DIR, iv, symbol), ignore_errors=True)
+
+
+def cached_report(symbol: str, render, interval: str = "1d") -> str:
+    """Return render(symbol), reusing the cached text while the symbol's inputs are unchanged."""
+    key = make_key(symbol, interval)
+    if key is None:
+        return render(symbol)
+
+    text = get(key)
+    if text is not None:
+        print(f"[report_cache] Hit for {symbol} ({interval})")
+        return text
+
+    # Concurrent requests for the same report render it once
+    with path_lock(_disk_path(key)):
+        text = get(key)
+        if text is None:
+            text = render(symbol)
+            # Inputs written while rendering may not be in the text; cache only if unchanged
+            if make_key(symbol, interval) == key:
+                put(key, text)
+    return text
+
+
+price_store.register_update_listener(lambda symbol, interval: invalidate(symbol, interval))
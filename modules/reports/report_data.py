@@ -0,0 +1,120 @@
+# modules/reports/report_data.py
+#
+# Data access for stock reports. A ReportData loads each source once for a
+# batch of symbols (company store or a legacy company_info.csv, indicator
+# store or a legacy technical_indicators.csv), reads only the columns the
+# report uses, and hands out one ReportInputs record per symbol.
+#
+# from modules.reports.report_data import ReportData
+# data = ReportData()
+# data.load(["TCS", "INFY"])
+# inputs = data.get("TCS")     # ReportInputs(symbol, company, tech) or None
+
+import os
+import re
+from typing import NamedTuple, Optional
+
+import pandas as pd
+
+from modules.data_fetcher.company_store import load_company_info
+from modules.indicators.indicator_store import indicator_columns, read_indicators
+
+# Lower-cased fields the report template reads
+COMPANY_FIELDS = {
+    "symbol", "companyname", "sector", "industry", "marketcap", "currentprice",
+    "pe", "bookvalue", "roe", "roce", "debt", "updatedat",
+}
+TECH_FIELDS = {
+    "symbol", "date", "close", "rsi_14", "macd", "macd_signal", "adx_14", "atr_14", "bb_upper", "bb_lower",
+}
+SUPERTREND_DIR = re.compile(r"^supertrend_\d+_dir$")
+
+
+class ReportInputs(NamedTuple):
+    symbol: str
+    company: pd.Series          # lower-cased company fields
+    tech: pd.Series             # latest indicator row, lower-cased columns
+
+    @property
+    def last_bar(self):
+        return self.tech.get("date")
+
+    @property
+    def fundamentals_at(self):
+        return self.company.get("updatedat")
+
+
+def _wanted_tech_column(name: str) -> bool:
+    name = name.lower()
+    return name in TECH_FIELDS or bool(SUPERTREND_DIR.match(name))
+
+
+def _by_symbol(df: pd.DataFrame) -> pd.DataFrame:
+    """Lower-case the columns and index by upper-case symbol (last row wins)."""
+    df = df.rename(columns=str.lower)
+    df["symbol"] = df["symbol"].astype(str).str.upper()
+    return df.drop_duplicates("symbol", keep="last").set_index("symbol", drop=False)
+
+
+def _append(loaded: pd.DataFrame, new: pd.DataFrame) -> pd.DataFrame:
+    if loaded.empty:
+        return new
+    return loaded if new.empty else pd.concat([loaded, new])
+
+
+class ReportData:
+    def __init__(self, company_csv_path: str = None, tech_csv_path: str = None, interval: str = "1d"):
+        self.company_csv_path = company_csv_path
+        self.tech_csv_path = tech_csv_path
+        self.interval = interval
+        self.company = pd.DataFrame()
+        self.tech = pd.DataFrame()
+        self._loaded = set()
+
+    def _load_company(self, symbols: list) -> pd.DataFrame:
+        if self.company_csv_path:
+            if not os.path.exists(self.company_csv_path):
+                print(f"Missing CSV. Ensure {self.company_csv_path} is present.")
+                return pd.DataFrame()
+            df = pd.read_csv(self.company_csv_path, usecols=lambda c: c.lower() in COMPANY_FIELDS)
+            return _by_symbol(df)
+        df = load_company_info(symbols)
+        if df.empty:
+            return df
+        return _by_symbol(df[[c for c in df.columns if c.lower() in COMPANY_FIELDS]])
+
+    def _load_tech(self, symbols: list) -> pd.DataFrame:
+        if self.tech_csv_path:
+            if not os.path.exists(self.tech_csv_path):
+                print(f"Missing CSV. Ensure {self.tech_csv_path} is present.")
+                return pd.DataFrame()
+            df = pd.read_csv(self.tech_csv_path, usecols=_wanted_tech_column)
+            return _by_symbol(df.sort_values("date", kind="stable"))
+
+        rows = []
+        for symbol in symbols:
+            columns = [c for c in indicator_columns(symbol, self.interval) if _wanted_tech_column(c)]
+            latest = read_indicators(symbol, self.interval, columns=columns, last_n=1) if columns else None
+            if latest is not None and not latest.empty:
+                rows.append(latest.assign(symbol=symbol))
+        return _by_symbol(pd.concat(rows, ignore_index=True)) if rows else pd.DataFrame()
+
+    def load(self, symbols) -> "ReportData":
+        """Load both sources for symbols not loaded yet; a legacy CSV is read whole on the first call only."""
+        pending = [s.upper() for s in symbols if s.upper() not in self._loaded]
+        if not pending:
+            return self
+        first = not self._loaded
+        if first or not self.company_csv_path:
+            self.company = _append(self.company, self._load_company(pending))
+        if first or not self.tech_csv_path:
+            self.tech = _append(self.tech, self._load_tech(pending))
+        self._loaded.update(pending)
+        return self
+
+    def get(self, symbol: str) -> Optional[ReportInputs]:
+        symbol = symbol.upper()
+        self.load([symbol])
+        if symbol not in self.company.index or symbol not in self.tech.index:
+            return None
+        return ReportInputs(symbol, self.company.loc[symbol], self.tech.loc[symbol])
@@ -0,0 +1,130 @@
+# modules/reports/scoring.py
+#
+# Vectorized versions of generate_stock_report.predict_stock_signal and
+# generate_verdict. One call scores every row of an indicator frame (one row
+# per symbol for a screener, one row per date for a backtest) with the same
+# rules and labels the scalar functions use for a single report.
+#
+# from modules.reports.scoring import score_signals
+# scored = score_signals(latest_rows)   # adds signal_score, signal, verdict_score, verdict_label, confidence, verdict
+
+import numpy as np
+import pandas as pd
+
+# Bump whenever a threshold or label below changes; cached reports are keyed on it
+SCORING_VERSION = 1
+
+NO_SIGNAL = "\n📉 No Signal: Insufficient data"
+NO_VERDICT = "❓ Verdict: Not enough data for signal confidence."
+
+# predict_stock_signal labels by score
+STRONG_BUY, BUY, WATCHLIST, NEUTRAL, STRONG_SELL = "🟢 Strong Buy", "✅ Buy", "⚪ Watchlist", "⚠️ Neutral", "🔴 Strong Sell"
+
+# generate_verdict labels by score
+VERDICT_LABELS = {
+    2: "🟢 Buy", 1: "🟡 Mild Bullish", 0: "⚪ Neutral", -1: "🟠 Mild Bearish", -2: "🔴 Sell",
+}
+VERDICT_STRONG_BUY, VERDICT_STRONG_SELL = "🟢 Strong Buy", "🔴 Strong Sell"
+
+
+def _numeric(df: pd.DataFrame, column: str) -> np.ndarray:
+    if column is None or column not in df.columns:
+        return np.full(len(df), np.nan)
+    return pd.to_numeric(df[column], errors="coerce").to_numpy(dtype="float64")
+
+
+def _supertrend_direction(df: pd.DataFrame, column: str):
+    """
+    (valid, up) arrays, reading values the way generate_report does: bools and ints
+    count, "True"/"False" strings are parsed, anything else (NaN, floats) is missing.
+    """
+    n = len(df)
+    if column is None or column not in df.columns:
+        return np.zeros(n, dtype=bool), np.zeros(n, dtype=bool)
+    values = df[column]
+    if pd.api.types.is_bool_dtype(values) and not values.isna().any():
+        return np.ones(n, dtype=bool), values.to_numpy(dtype=bool)
+
+    valid = np.zeros(n, dtype=bool)
+    up = np.zeros(n, dtype=bool)
+    for i, raw in enumerate(values.to_numpy(dtype=object)):
+        if isinstance(raw, str):
+            valid[i], up[i] = True, raw.strip().lower() == "true"
+        elif isinstance(raw, (bool, int, np.bool_, np.integer)):
+            valid[i], up[i] = True, bool(raw)
+    return valid, up
+
+
+def _default_supertrend_column(df: pd.DataFrame):
+    return next((col for col in df.columns if col.startswith("supertrend_") and col.endswith("_dir")), None)
+
+
+def score_signals(df: pd.DataFrame, rsi_col: str = "rsi_14", adx_col: str = "adx_14",
+                  supertrend_col: str = None, adx_decimals: int = 2) -> pd.DataFrame:
+    """
+    Copy of df with the report's scoring applied to every row:
+      signal_score / signal   - predict_stock_signal (score is NaN when RSI, MACD or Supertrend is missing)
+      verdict_score / verdict_label / confidence / verdict - generate_verdict
+    NaN plays the role of None. ADX is rounded to `adx_decimals` first, as generate_report
+    does before calling the scalar rules (None keeps the raw value).
+    """
+    supertrend_col = supertrend_col or _default_supertrend_column(df)
+    rsi = _numeric(df, rsi_col)
+    macd = _numeric(df, "macd")
+    macd_signal = _numeric(df, "macd_signal")
+    adx = _numeric(df, adx_col)
+    if adx_decimals is not None:
+        adx = np.round(adx, adx_decimals)
+    bb_upper, bb_lower, close = _numeric(df, "bb_upper"), _numeric(df, "bb_lower"), _numeric(df, "close")
+    st_valid, st_up = _supertrend_direction(df, supertrend_col)
+
+    rsi_ok = ~np.isnan(rsi)
+    macd_ok = ~np.isnan(macd) & ~np.isnan(macd_signal)
+    adx_ok = ~np.isnan(adx)
+    bb_ok = ~(np.isnan(bb_upper) | np.isnan(bb_lower) | np.isnan(close))
+
+    with np.errstate(invalid="ignore"):
+        rsi_vote = np.where(rsi < 30, 1, np.where(rsi > 70, -1, 0))
+        macd_vote = np.where(macd > macd_signal, 1, np.where(macd < macd_signal, -1, 0))
+        st_vote = np.where(st_valid, np.where(st_up, 1, -1), 0)
+        bb_vote = np.where(bb_ok, np.where(close < bb_lower, 1, np.where(close > bb_upper, -1, 0)), 0)
+        signal_adx_vote = np.where(adx > 40, 1, 0)
+        verdict_adx_vote = np.where(adx > 20, 1, 0)
+
+    # --- predict_stock_signal ---
+    has_signal = rsi_ok & macd_ok & st_valid
+    signal_score = rsi_vote + macd_vote + st_vote + signal_adx_vote + bb_vote
+    signal = np.select(
+        [~has_signal, signal_score >= 3, signal_score == 2, signal_score == 1, signal_score <= -2],
+        [NO_SIGNAL, STRONG_BUY, BUY, WATCHLIST, STRONG_SELL],
+        default=NEUTRAL,
+    ).astype(object)
+
+    # --- generate_verdict ---
+    verdict_score = (np.where(rsi_ok, rsi_vote, 0) + np.where(macd_ok, macd_vote, 0) + st_vote
+                     + np.where(adx_ok, verdict_adx_vote, 0) + bb_vote)
+    total_possible = (rsi_ok.astype(int) + macd_ok + st_valid + adx_ok + bb_ok)
+    has_verdict = total_possible > 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        confidence = np.round(np.abs(verdict_score) / total_possible * 100)
+    confidence = np.where(has_verdict, confidence, np.nan)
+
+    verdict_label = np.select(
+        [verdict_score >= 3, verdict_score <= -3] + [verdict_score == s for s in VERDICT_LABELS],
+        [VERDICT_STRONG_BUY, VERDICT_STRONG_SELL] + list(VERDICT_LABELS.values()),
+        default=VERDICT_LABELS[0],
+    )
+    verdict_label = np.where(has_verdict, verdict_label.astype(object), None)
+    verdict = np.array([
+        f"{label} (Confidence: {int(conf)}%)" if ok else NO_VERDICT
+        for label, conf, ok in zip(verdict_label, confidence, has_verdict)
+    ], dtype=object)
+
+    out = df.copy()
+    out["signal_score"] = np.where(has_signal, signal_score, np.nan)
+    out["signal"] = signal
+    out["verdict_score"] = np.where(has_verdict, verdict_score, np.nan)
+    out["verdict_label"] = verdict_label
+    out["confidence"] = confidence
+    out["verdict"] = verdict
+    return out
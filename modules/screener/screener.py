@@ -0,0 +1,268 @@
+# modules/screener/screener.py
+#
+# Universe screener: latest stored indicator row per symbol, scored with the
+# report rules (modules/reports/scoring.py), filtered by signal, sector,
+# market-cap class and indicator thresholds, ranked by score.
+# Per-symbol rows and the fundamentals tables are cached by file mtime, so a
+# warm scan only stats files.
+#
+# from modules.screener.screener import scan
+# scan("NIFTY500", signal="strong_buy", sector="IT", cap="large", where=["rsi_14<60"], top=10)
+#
+# python -m modules.screener.screener NIFTY500 strong_buy --sector IT --cap large --where "adx_14>25"
+# python -m modules.screener.screener NIFTY500 --refresh     # rebuild stored indicators first
+
+import argparse
+import glob
+import operator
+import os
+import re
+import threading
+
+import pandas as pd
+
+from modules.data_classifier.classify_market_cap import classify_cap
+from modules.data_fetcher.company_store import DB_PATH, load_company_info
+from modules.data_fetcher.nse_client import ALL_INDICES, get_nse_client
+from modules.data_fetcher.price_store import period_for_bars, update_prices_many
+from modules.data_fetcher.snapshot_indices import _snapshot_path
+from modules.indicators.indicator_store import INDICATOR_STORE_DIR, indicator_path, latest_indicators, write_indicators
+from modules.indicators.registry import required_history_bars
+from modules.indicators.universe import compute_universe_indicators
+from modules.reports.scoring import BUY, NEUTRAL, NO_SIGNAL, STRONG_BUY, STRONG_SELL, WATCHLIST, score_signals
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+CAP_CSV_PATH = os.path.join(PROJECT_ROOT, "data", "processed", "classified_market_caps.csv")
+
+DEFAULT_TOP = 10
+
+SIGNALS = {
+    "strong_buy": STRONG_BUY, "buy": BUY, "watchlist": WATCHLIST,
+    "neutral": NEUTRAL, "strong_sell": STRONG_SELL, "no_signal": NO_SIGNAL,
+}
+BEARISH_SIGNALS = {"strong_sell"}
+FUNDAMENTAL_COLUMNS = ["symbol", "company_name", "sector", "industry", "cap_category"]
+CAP_CLASSES = {"large": "Large Cap", "mid": "Mid Cap", "small": "Small Cap"}
+
+OPERATORS = {">=": operator.ge, "<=": operator.le, "==": operator.eq, "!=": operator.ne,
+             ">": operator.gt, "<": operator.lt, "=": operator.eq}
+CONDITION_RE = re.compile(r"^\s*([A-Za-z_][\w]*)\s*(>=|<=|==|!=|>|<|=)\s*(-?[\d.]+)\s*$")
+
+_lock = threading.Lock()
+_rows = {}           # indicator path -> (mtime, row dict)
+_tables = {}         # name -> (mtime, DataFrame)
+_constituents = {}   # index name -> symbols fetched from NSE this session
+
+
+# --- Universe ---
+
+def _index_key(name: str) -> str:
+    return re.sub(r"[^A-Z0-9&]", "", name.upper())
+
+
+INDEX_NAMES = {_index_key(name): name for name in ALL_INDICES}
+
+
+def index_constituents(index_name: str) -> list:
+    """Symbols of an NSE index: from the newest local snapshot, else fetched once from NSE."""
+    pattern = _snapshot_path(index_name, "*")
+    snapshots = sorted(glob.glob(pattern))
+    if snapshots:
+        df = pd.read_csv(snapshots[-1], usecols=lambda c: c == "symbol")
+        symbols = df["symbol"].dropna().astype(str).str.upper().tolist()
+    else:
+        if index_name not in _constituents:
+            rows = get_nse_client().index_data(index_name)
+            _constituents[index_name] = [str(r["symbol"]).upper() for r in rows if r.get("symbol")]
+        symbols = _constituents[index_name]
+    # The first row of an index payload is the index itself
+    return [s for s in symbols if _index_key(s) != _index_key(index_name)]
+
+
+def stored_symbols(interval: str = "1d") -> list:
+    folder = os.path.join(INDICATOR_STORE_DIR, interval)
+    if not os.path.isdir(folder):
+        return []
+    return sorted(f[:-len(".parquet")] for f in os.listdir(folder) if f.endswith(".parquet"))
+
+
+def resolve_universe(universe, interval: str = "1d") -> list:
+    """
+    "NIFTY500" / "NIFTY 500" / "nifty_it" -> index constituents, "ALL" -> every symbol with
+    stored indicators, "TCS,INFY" or a list -> those symbols.
+    """
+    if isinstance(universe, (list, tuple, set)):
+        return [s.upper() for s in universe]
+    if universe is None or universe.strip().upper() == "ALL":
+        return stored_symbols(interval)
+    key = _index_key(universe)
+    if key in INDEX_NAMES:
+        return index_constituents(INDEX_NAMES[key])
+    return [s.strip().upper() for s in universe.split(",") if s.strip()]
+
+
+# --- Cached inputs ---
+
+def _mtime(*paths):
+    mtimes = [os.path.getmtime(p) for p in paths if os.path.exists(p)]
+    return max(mtimes) if mtimes else None
+
+
+def latest_rows(symbols, interval: str = "1d") -> pd.DataFrame:
+    """Latest stored indicator row per symbol; a file is only re-read when its mtime changes."""
+    records = []
+    for symbol in symbols:
+        path = indicator_path(symbol, interval)
+        mtime = _mtime(path)
+        if mtime is None:
+            continue
+        cached = _rows.get(path)
+        if cached is None or cached[0] != mtime:
+            row = latest_indicators(symbol, interval)
+            if row is None:
+                continue
+            cached = (mtime, {**row.to_dict(), "symbol": symbol.upper()})
+            with _lock:
+                _rows[path] = cached
+        records.append(cached[1])
+    return pd.DataFrame(records)
+
+
+def _cached_table(name, paths, loader) -> pd.DataFrame:
+    mtime = _mtime(*paths)
+    if mtime is None:
+        return pd.DataFrame()
+    cached = _tables.get(name)
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, loader())
+        with _lock:
+            _tables[name] = cached
+    return cached[1]
+
+
+def fundamentals() -> pd.DataFrame:
+    """symbol, company_name, sector, industry, cap_category for every known company."""
+    info = _cached_table("company_info", [DB_PATH, DB_PATH + "-wal"], load_company_info)
+    if not info.empty:
+        info = pd.DataFrame({
+            "symbol": info["symbol"].astype(str).str.upper(),
+            "company_name": info.get("companyName"),
+            "sector": info.get("sector"),
+            "industry": info.get("industry"),
+            # yfinance market cap is in rupees, classify_cap thresholds are in crores
+            "cap_category": pd.to_numeric(info.get("marketCap"), errors="coerce").map(
+                lambda cap: classify_cap(cap / 1e7) if pd.notna(cap) else None),
+        })
+
+    caps = _cached_table("market_caps", [CAP_CSV_PATH],
+                         lambda: pd.read_csv(CAP_CSV_PATH, usecols=["symbol", "cap_category"]))
+    if not caps.empty:
+        caps = caps.assign(symbol=caps["symbol"].astype(str).str.upper()).drop_duplicates("symbol")
+        if info.empty:
+            info = caps
+        else:
+            # The NSE-based classification wins over the one derived from yfinance
+            info = info.merge(caps, on="symbol", how="outer", suffixes=("_info", ""))
+            info["cap_category"] = info["cap_category"].fillna(info.pop("cap_category_info"))
+    return info.reindex(columns=FUNDAMENTAL_COLUMNS)
+
+
+# --- Filters ---
+
+def parse_condition(text: str):
+    """'rsi_14<30' -> ("rsi_14", operator.lt, 30.0)"""
+    match = CONDITION_RE.match(text)
+    if not match:
+        raise ValueError(f"Invalid condition: {text!r} (expected e.g. rsi_14<30)")
+    column, op, value = match.groups()
+    return column.lower(), OPERATORS[op], float(value)
+
+
+def scan(universe="NIFTY500", signal: str = None, sector: str = None, cap: str = None, where=None,
+         top: int = DEFAULT_TOP, interval: str = "1d") -> pd.DataFrame:
+    """
+    Ranked matches from the universe's stored indicators.
+      signal - one of SIGNALS ("strong_buy", "buy", ...)
+      sector - case-insensitive substring of sector or industry
+      cap    - "large" / "mid" / "small"
+      where  - conditions like ["rsi_14<30", "adx_14>25"]
+    """
+    symbols = resolve_universe(universe, interval)
+    rows = latest_rows(symbols, interval)
+    if rows.empty:
+        print(f"[screener] No stored indicators for {universe} ({len(symbols)} symbols)")
+        return rows
+
+    df = score_signals(rows)
+    if sector or cap:
+        df = df.merge(fundamentals(), on="symbol", how="left")
+
+    if signal:
+        key = signal.lower()
+        if key not in SIGNALS:
+            raise ValueError(f"Unknown signal {signal!r}; choose from {sorted(SIGNALS)}")
+        df = df[df["signal"] == SIGNALS[key]]
+    if sector:
+        needle = sector.lower()
+        df = df[df["sector"].fillna("").str.lower().str.contains(needle, regex=False)
+                | df["industry"].fillna("").str.lower().str.contains(needle, regex=False)]
+    if cap:
+        wanted = CAP_CLASSES.get(cap.lower().replace("cap", "").strip(), cap)
+        df = df[df["cap_category"].fillna("").str.lower() == wanted.lower()]
+    for condition in where or []:
+        column, op, value = parse_condition(condition)
+        if column not in df.columns:
+            raise ValueError(f"Unknown column in condition: {column}")
+        df = df[op(pd.to_numeric(df[column], errors="coerce"), value)]
+
+    ascending = (signal or "").lower() in BEARISH_SIGNALS
+    df = df.sort_values(["signal_score", "verdict_score", "confidence"],
+                        ascending=[ascending, ascending, False], na_position="last")
+    return df.head(top).reset_index(drop=True)
+
+
+def format_scan(df: pd.DataFrame, title: str) -> str:
+    """Plain-text result list for Telegram or the console."""
+    if df is None or df.empty:
+        return f"🔎 {title}\nNo matches."
+    lines = [f"🔎 {title} – top {len(df)}"]
+    for i, row in enumerate(df.itertuples(index=False), start=1):
+        close = getattr(row, "close", None)
+        price = f"₹{close:,.2f}" if close is not None and pd.notna(close) else "N/A"
+        lines.append(f"{i}. {row.symbol} {price} | {row.signal.strip()} | {row.verdict}")
+    return "\n".join(lines)
+
+
+def refresh_universe(universe="NIFTY500", config: dict = None, interval: str = "1d") -> int:
+    """Update stored prices for the universe and rewrite every symbol's stored indicators in one pass."""
+    symbols = resolve_universe(universe, interval)
+    # Keep a year of rows on top of the warm-up so screens and charts have history to show
+    update_prices_many(symbols, period=period_for_bars(required_history_bars(config, output_bars=250), interval),
+                       interval=interval)
+    long_df = compute_universe_indicators(symbols, config, interval)
+    for symbol, df in long_df.groupby("symbol", sort=False):
+        write_indicators(df, symbol, interval)
+    print(f"[screener] Stored indicators for {long_df['symbol'].nunique() if not long_df.empty else 0} symbols")
+    return 0 if long_df.empty else long_df["symbol"].nunique()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rank a universe by the report's signal score")
+    parser.add_argument("universe", nargs="?", default="NIFTY500")
+    parser.add_argument("signal", nargs="?", choices=sorted(SIGNALS))
+    parser.add_argument("--sector")
+    parser.add_argument("--cap", help="large / mid / small")
+    parser.add_argument("--where", action="append", help="indicator condition, e.g. rsi_14<30 (repeatable)")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP)
+    parser.add_argument("--interval", default="1d")
+    parser.add_argument("--refresh", action="store_true", help="update prices and stored indicators first")
+    args = parser.parse_args()
+
+    if args.refresh:
+        refresh_universe(args.universe, interval=args.interval)
+    result = scan(args.universe, args.signal, args.sector, args.cap, args.where, args.top, args.interval)
+    print(format_scan(result, f"{args.universe} {args.signal or 'all signals'}"))
+
+
+if __name__ == "__main__":
+    main()
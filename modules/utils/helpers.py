@@ -0,0 +1,56 @@
+# modules/utils/helpers.py
+
+import os
+import threading
+
+_path_locks = {}
+_path_locks_guard = threading.Lock()
+
+
+def path_lock(path: str) -> threading.Lock:
+    """Return a process-wide lock for a file path (for read-modify-write cycles)."""
+    path = os.path.abspath(path)
+    with _path_locks_guard:
+        if path not in _path_locks:
+            _path_locks[path] = threading.Lock()
+        return _path_locks[path]
+
+
+def atomic_write_parquet(df, path: str, **kwargs):
+    """Write a DataFrame to Parquet via a temp file + rename so readers never see a partial file."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        df.to_parquet(tmp_path, index=False, **kwargs)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return path
+
+
+def atomic_write_csv(df, path: str, **kwargs):
+    """CSV counterpart of atomic_write_parquet."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        df.to_csv(tmp_path, index=False, **kwargs)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return path
+
+
+def atomic_write_text(text: str, path: str, encoding: str = "utf-8"):
+    """Text counterpart of atomic_write_parquet."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, "w", encoding=encoding) as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return path
@@ -0,0 +1,179 @@
+# modules/utils/symbol_resolver.py
+#
+# In-memory index over data/raw/listed_companies.csv for resolving user input
+# to NSE symbols: exact symbol, normalized name, prefix/token and trigram fuzzy
+# lookups. The index is built once and rebuilt when the CSV changes on disk.
+#
+# from modules.utils.symbol_resolver import get_resolver
+# get_resolver().resolve("infosys")      -> "INFY"
+# get_resolver().search("tata", limit=5) -> [("TATASTEEL", "Tata Steel Limited", 0.9), ...]
+
+import bisect
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+from typing import NamedTuple
+
+import pandas as pd
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+CSV_PATH = os.path.join(PROJECT_ROOT, "data", "raw", "listed_companies.csv")
+
+NAME_SUFFIXES = {"LIMITED", "LTD", "LTD.", "CO", "COMPANY", "CORPORATION", "CORP"}
+RELOAD_CHECK_SECONDS = 2.0  # how often the CSV mtime is checked
+MIN_FUZZY_SIMILARITY = 0.3
+
+# Score bands; a candidate keeps the best score of any lookup that found it
+EXACT_SYMBOL, EXACT_NAME, PREFIX, TOKEN, FUZZY = 1.0, 0.95, 0.85, 0.75, 0.7
+
+
+def normalize(text: str) -> str:
+    """Upper-case, strip punctuation and legal suffixes: 'Tata Motors Ltd.' -> 'TATA MOTORS'."""
+    tokens = re.sub(r"[^A-Z0-9& ]+", " ", str(text).upper()).split()
+    while len(tokens) > 1 and tokens[-1] in NAME_SUFFIXES:
+        tokens.pop()
+    return " ".join(tokens)
+
+
+def trigrams(text: str) -> set:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _prefix_range(sorted_keys, prefix):
+    lo = bisect.bisect_left(sorted_keys, (prefix,))
+    hi = bisect.bisect_left(sorted_keys, (prefix + "\uffff",))
+    return sorted_keys[lo:hi]
+
+
+class _Index(NamedTuple):
+    names: dict            # symbol -> company name
+    by_name: dict          # normalized name -> symbol
+    keys: list             # sorted (key, symbol) for symbol and name prefixes
+    token_keys: list       # sorted (name token, symbol) for per-token prefixes
+    tri_index: dict        # trigram -> symbols
+    tri_sets: dict         # symbol -> trigrams
+
+
+class SymbolResolver:
+    def __init__(self, csv_path: str = CSV_PATH):
+        self.csv_path = csv_path
+        self._mtime = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self._build(pd.DataFrame(columns=["symbol", "name"]))
+        self._maybe_reload(force=True)
+
+    def _build(self, df: pd.DataFrame):
+        names = {}
+        by_name = {}
+        keys = []
+        token_keys = []
+        tri_index = defaultdict(set)
+        tri_sets = {}
+
+        for symbol, name in zip(df["symbol"].astype(str), df["name"].astype(str)):
+            symbol = symbol.strip().upper()
+            norm = normalize(name)
+            names[symbol] = name.strip()
+            by_name.setdefault(norm, symbol)
+            keys.append((symbol, symbol))
+            keys.append((norm, symbol))
+            for token in norm.split():
+                token_keys.append((token, symbol))
+            grams = trigrams(norm) | trigrams(symbol)
+            tri_sets[symbol] = grams
+            for gram in grams:
+                tri_index[gram].add(symbol)
+
+        # One attribute write swaps in the new index, so readers never mix old and new parts
+        self._index = _Index(names, by_name, sorted(keys), sorted(token_keys), tri_index, tri_sets)
+
+    def _maybe_reload(self, force: bool = False):
+        now = time.monotonic()
+        if not force and now - self._checked_at < RELOAD_CHECK_SECONDS:
+            return
+        with self._lock:
+            self._checked_at = now
+            try:
+                mtime = os.path.getmtime(self.csv_path)
+            except OSError:
+                if force:
+                    print(f"[symbol_resolver] Company list not found: {self.csv_path}")
+                return
+            if mtime == self._mtime:
+                return
+            self._build(pd.read_csv(self.csv_path))
+            self._mtime = mtime
+            print(f"[symbol_resolver] Indexed {len(self._index.names)} companies from {self.csv_path}")
+
+    def lookup(self, symbol: str):
+        """Exact symbol lookup; returns the company name or None."""
+        self._maybe_reload()
+        return self._index.names.get(symbol.strip().upper())
+
+    def search(self, query: str, limit: int = 5) -> list:
+        """Ranked candidates as (symbol, name, score), best first."""
+        self._maybe_reload()
+        index = self._index  # a reload during the search must not mix two indexes
+        raw = query.strip().upper()
+        norm = normalize(query)
+        if not norm:
+            return []
+
+        scores = {}
+
+        def offer(symbol, score):
+            if score > scores.get(symbol, 0.0):
+                scores[symbol] = score
+
+        if raw in index.names:
+            offer(raw, EXACT_SYMBOL)
+        if norm in index.by_name:
+            offer(index.by_name[norm], EXACT_NAME)
+
+        # Prefix of a symbol or a full name; shorter keys (closer matches) rank first
+        for key, symbol in _prefix_range(index.keys, norm):
+            offer(symbol, PREFIX - 0.001 * min(len(key) - len(norm), 50))
+
+        # Every query token is a prefix of some token in the name ("steel" -> Tata Steel)
+        candidates = None
+        for token in norm.split():
+            found = {symbol for _, symbol in _prefix_range(index.token_keys, token)}
+            candidates = found if candidates is None else candidates & found
+        for symbol in candidates or ():
+            offer(symbol, TOKEN)
+
+        # Trigram (Dice) similarity for typos and partial names
+        grams = trigrams(norm)
+        overlap = defaultdict(int)
+        for gram in grams:
+            for symbol in index.tri_index.get(gram, ()):
+                overlap[symbol] += 1
+        for symbol, shared in overlap.items():
+            similarity = 2 * shared / (len(grams) + len(index.tri_sets[symbol]))
+            if similarity >= MIN_FUZZY_SIMILARITY:
+                offer(symbol, FUZZY * similarity)
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        return [(symbol, index.names[symbol], round(score, 3)) for symbol, score in ranked]
+
+    def resolve(self, query: str):
+        """Best single symbol for the input, or None."""
+        matches = self.search(query, limit=1)
+        return matches[0][0] if matches else None
+
+
+_resolvers = {}
+_resolvers_lock = threading.Lock()
+
+
+def get_resolver(csv_path: str = None) -> SymbolResolver:
+    """Shared resolver per company list, built on first use."""
+    csv_path = os.path.abspath(csv_path or CSV_PATH)
+    with _resolvers_lock:
+        if csv_path not in _resolvers:
+            _resolvers[csv_path] = SymbolResolver(csv_path)
+        return _resolvers[csv_path]
@@ -3,7 +3,11 @@
 from telegram import Update
 from telegram.ext import ApplicationBuilder, CommandHandler, MessageHandler, filters, ContextTypes
 from main import run_pipeline_for_symbol  # This runs your full logic
-import pandas as pd
+from modules.utils.symbol_resolver import EXACT_NAME, get_resolver
+from modules.screener.screener import CAP_CLASSES, SIGNALS, format_scan, scan
+from modules.reports.charts import chart_png_async
+from modules.utils.telegram_sender import flush
+import asyncio
 import os
 from dotenv import load_dotenv
 
@@ -23,39 +27,25 @@ CHAT_ID = os.getenv("CHAT_ID")
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 CSV_PATH = os.path.join(PROJECT_ROOT, "data", "raw", "listed_companies.csv")
 
-def resolve_symbol_from_name(name):
-    try:
-        df = pd.read_csv(CSV_PATH)
-        match = df[df['name'].str.contains(name, case=False, na=False)]
+# Second-best match within this score of the best means the input is ambiguous
+AMBIGUITY_MARGIN = 0.05
+# Seconds to wait for a queued report to reach the chat before confirming
+REPORT_DELIVERY_TIMEOUT = 30
 
-        if not match.empty:
-            return match.iloc[0]["symbol"]
-        else:
-            print(f"[WARN] No match found for: {name}")
-            return None
 
+def resolve_symbol_from_name(name):
+    try:
+        symbol = get_resolver(CSV_PATH).resolve(name)
     except Exception as e:
         print(f"[ERROR] While resolving symbol: {e}")
         return None
+    if not symbol:
+        print(f"[WARN] No match found for: {name}")
+    return symbol
 
 def resolve_symbol(user_input):
-    user_input = user_input.strip().upper()
-
     try:
-        df = pd.read_csv(CSV_PATH)
-        df["symbol"] = df["symbol"].astype(str).str.upper()
-        df["name"] = df["name"].astype(str).str.upper()
-
-        # Check if input matches symbol
-        if user_input in df["symbol"].values:
-            return user_input
-
-        # Check if input matches company name
-        match = df[df["name"].str.contains(user_input)]
-        if not match.empty:
-            return match.iloc[0]["symbol"]
-
-        return None
+        return get_resolver(CSV_PATH).resolve(user_input)
     except Exception as e:
         print(f"[ERROR] While resolving symbol: {e}")
         return None
@@ -78,12 +68,53 @@ async def handle_help(update: Update, context: ContextTypes.DEFAULT_TYPE):
         "📖 *Bot Help Menu*\n\n"
         "Here’s what you can ask me:\n"
         "➡️ `/stock TCS` – Get technical analysis of a stock\n"
+        "➡️ `/scan NIFTY500 strong_buy` – Top matches in an index (add `sector=IT`, `cap=large`, `rsi_14<40`, `top=20`)\n"
         "➡️ `/health` – Check if bot is running\n"
         "➡️ Just type a stock name like *INFY*, and I’ll analyze it!\n\n"
         "🔁 I respond in real-time with predictions & indicators."
     )
     await context.bot.send_message(chat_id=chat_id, text=msg, parse_mode="Markdown")
 
+def parse_scan_args(args):
+    """["NIFTY500", "strong_buy", "sector=IT", "cap=large", "rsi_14<40", "top=5"] -> scan() kwargs"""
+    kwargs = {"universe": "NIFTY500", "where": []}
+    for i, arg in enumerate(args):
+        key, _, value = arg.partition("=")
+        if key.lower() in ("sector", "cap", "top") and value and not value.startswith("="):
+            kwargs[key.lower()] = int(value) if key.lower() == "top" else value
+        elif arg.lower() in SIGNALS:
+            kwargs["signal"] = arg.lower()
+        elif arg.lower() in CAP_CLASSES:
+            kwargs["cap"] = arg.lower()
+        elif any(op in arg for op in "<>="):
+            kwargs["where"].append(arg)
+        elif i == 0:
+            kwargs["universe"] = arg
+        else:
+            raise ValueError(f"Unrecognised option: {arg}")
+    return kwargs
+
+
+async def handle_scan(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    chat_id = update.effective_chat.id
+    try:
+        kwargs = parse_scan_args(context.args or [])
+    except ValueError as e:
+        await context.bot.send_message(chat_id=chat_id, text=f"❌ {e}\nTry: /scan NIFTY500 strong_buy sector=IT")
+        return
+
+    await context.bot.send_chat_action(chat_id=chat_id, action="typing")
+    try:
+        # Reads local files only, but keep it off the event loop
+        result = await asyncio.to_thread(scan, **kwargs)
+    except Exception as e:
+        print(f"[ERROR] Scan failed: {e}")
+        await context.bot.send_message(chat_id=chat_id, text=f"❌ Scan failed: {e}")
+        return
+
+    title = " ".join(context.args or ["NIFTY500"])
+    await context.bot.send_message(chat_id=chat_id, text=format_scan(result, title))
+
 # ---- Main handler for all text input ----
 
 async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -103,16 +134,32 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     print(f"📩 Received from {chat_id}: {text}")
 
-    symbol = resolve_symbol(text)
-    if not symbol:
+    matches = get_resolver(CSV_PATH).search(text, limit=5)
+    if not matches:
         await context.bot.send_message(chat_id=chat_id, text="❌ Company not found. Please check the name or symbol.")
         return
 
+    # Ask instead of guessing when several companies match about equally well (e.g. "TATA")
+    top_score = matches[0][2]
+    if top_score < EXACT_NAME and len(matches) > 1 and matches[1][2] >= top_score - AMBIGUITY_MARGIN:
+        options = "\n".join(f"• {sym} – {name}" for sym, name, _ in matches)
+        await context.bot.send_message(chat_id=chat_id, text=f"🤔 Did you mean one of these?\n{options}")
+        return
+
+    symbol = matches[0][0]
+
     await context.bot.send_message(chat_id=chat_id, text=f"🔍 Processing {symbol}...")
 
     success = run_pipeline_for_symbol(symbol, chat_id)
     if success:
+        # The report goes out through the outbound queue; confirm only after it is delivered
+        await asyncio.to_thread(flush, chat_id, REPORT_DELIVERY_TIMEOUT)
         await context.bot.send_message(chat_id=chat_id, text=f"✅ Report sent for {symbol}")
+        # Rendered in the chart process pool (or read from the PNG cache) without blocking the loop
+        png = await chart_png_async(symbol)
+        if png:
+            await context.bot.send_photo(chat_id=chat_id, photo=png,
+                                         caption=f"📊 {symbol} – Bollinger bands, Supertrend, RSI, MACD")
     else:
         await context.bot.send_message(chat_id=chat_id, text=f"❌ Failed to generate report for {symbol}")
 
@@ -124,9 +171,13 @@ def main():
     token = os.getenv("TELEGRAM_TOKEN")
     app = ApplicationBuilder().token(token).build()
 
+    # Build the symbol index once at startup instead of on the first message
+    get_resolver(CSV_PATH)
+
     # Command handlers
     app.add_handler(CommandHandler("start", handle_start))
     app.add_handler(CommandHandler("help", handle_help))
+    app.add_handler(CommandHandler("scan", handle_scan))
 
     # Message handler
     app.add_handler(MessageHandler(filters.TEXT & (~filters.COMMAND), handle_message))
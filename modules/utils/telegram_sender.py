@@ -1,7 +1,23 @@
 # modules/utils/telegram_sender.py
+#
+# Outbound Telegram messages. send_message() only queues: a background thread
+# runs an asyncio loop with one pooled httpx client and delivers each chat's
+# messages in order, paced by a per-chat and a global token bucket. A 429
+# pauses the chat for the `retry_after` Telegram asks for; network errors and
+# 5xx responses are retried with jittered exponential backoff. Messages over
+# Telegram's 4096-character limit are split at line breaks.
+#
+# send_message(chat_id, report)      # returns immediately
+# flush(chat_id, timeout=30)         # wait until that chat's queue is delivered
 
-import os
-import requests
+import asyncio
+import atexit
+import random
+import threading
+import time
+from concurrent.futures import Future
+
+import httpx
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -11,15 +27,201 @@ chat_id = "675105848"
 
 BASE_URL = f"https://api.telegram.org/bot{token}"
 
-def send_message(chat_id, message):
-    url = f"{BASE_URL}/sendMessage"
-    payload = {
-        "chat_id": chat_id,
-        "text": message,
-        "parse_mode": "HTML"
-    }
-    response = requests.post(url, data=payload)
-    if response.status_code != 200:
-        print(f"❌ Failed to send message: {response.text}")
-    else:
-        print(f"✅ Message sent to chat {chat_id}")
+MAX_MESSAGE_LENGTH = 4096    # UTF-16 code units, as Telegram counts them
+GLOBAL_RATE = 30.0           # messages/second across all chats
+CHAT_RATE = 1.0              # messages/second to a single chat
+CHAT_BURST = 3
+MAX_RETRIES = 5
+BACKOFF_BASE = 0.5           # seconds; doubled per attempt, full jitter
+BACKOFF_MAX = 30.0
+EXIT_FLUSH_TIMEOUT = 30.0
+
+POOL_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10)
+TIMEOUT = httpx.Timeout(10.0, connect=5.0)
+
+
+def _fit(text: str, limit: int) -> int:
+    """Number of leading characters of text that fit in `limit` UTF-16 code units."""
+    units = 0
+    for i, ch in enumerate(text):
+        units += 2 if ord(ch) > 0xFFFF else 1
+        if units > limit:
+            return i
+    return len(text)
+
+
+def split_message(text: str, limit: int = MAX_MESSAGE_LENGTH) -> list:
+    """Parts of at most `limit` units, cut at the last newline (else space) that fits."""
+    parts = []
+    while text:
+        size = _fit(text, limit)
+        if size == len(text):
+            parts.append(text)
+            break
+        cut = text.rfind("\n", 0, size)
+        if cut <= 0:
+            cut = text.rfind(" ", 0, size)
+        if cut <= 0:
+            cut = size
+        parts.append(text[:cut])
+        text = text[cut + 1:] if text[cut] in "\n " else text[cut:]
+    return parts
+
+
+class TokenBucket:
+    """`rate` tokens per second up to `capacity`; only used from the sender loop's thread."""
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    def _wait(self) -> float:
+        """Seconds until a token is free, or 0.0 after taking one."""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def block(self, seconds: float):
+        """Hand out no tokens for `seconds` (Telegram's retry_after)."""
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+        self.tokens = 0.0
+
+    async def acquire(self):
+        while (wait := self._wait()) > 0:
+            await asyncio.sleep(wait)
+
+
+def _backoff(attempt: int) -> float:
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+
+def _retry_after(response) -> float:
+    try:
+        return float(response.json()["parameters"]["retry_after"])
+    except Exception:
+        return float(response.headers.get("Retry-After", 1))
+
+
+class OutboundQueue:
+    def __init__(self, base_url: str = BASE_URL):
+        self.base_url = base_url
+        self._loop = None
+        self._client = None
+        self._start_lock = threading.Lock()
+        # Owned by the loop thread
+        self._queues = {}
+        self._chat_buckets = {}
+        self._global_bucket = TokenBucket(GLOBAL_RATE, GLOBAL_RATE)
+        # Undelivered parts per chat, shared with callers
+        self._pending = {}
+        self._cond = threading.Condition()
+
+    def _ensure_started(self):
+        with self._start_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._run, name="telegram-outbound", daemon=True).start()
+
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+        self._client = httpx.AsyncClient(base_url=self.base_url, limits=POOL_LIMITS, timeout=TIMEOUT)
+        self._loop.run_forever()
+
+    def send(self, chat_id, text: str, parse_mode: str = "HTML") -> list:
+        """Queue a message (split if needed); returns one Future per part, resolving to True once delivered."""
+        self._ensure_started()
+        key = str(chat_id)
+        futures = []
+        for part in split_message(text):
+            future = Future()
+            with self._cond:
+                self._pending[key] = self._pending.get(key, 0) + 1
+            payload = {"chat_id": chat_id, "text": part}
+            if parse_mode:
+                payload["parse_mode"] = parse_mode
+            self._loop.call_soon_threadsafe(self._enqueue, key, payload, future)
+            futures.append(future)
+        return futures
+
+    def flush(self, chat_id=None, timeout: float = None) -> bool:
+        """Wait until every queued part (for one chat, or all chats) is delivered or given up on."""
+        key = None if chat_id is None else str(chat_id)
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: (sum(self._pending.values()) if key is None else self._pending.get(key, 0)) == 0, timeout)
+
+    def _enqueue(self, key, payload, future):
+        queue = self._queues.get(key)
+        if queue is None:
+            queue = self._queues[key] = asyncio.Queue()
+            self._loop.create_task(self._drain(key, queue))
+        queue.put_nowait((payload, future))
+
+    async def _drain(self, key, queue):
+        # One task per chat with queued messages keeps that chat's parts in order
+        bucket = self._chat_buckets.setdefault(key, TokenBucket(CHAT_RATE, CHAT_BURST))
+        while not queue.empty():
+            payload, future = queue.get_nowait()
+            try:
+                delivered = await self._deliver(payload, bucket)
+            except Exception as e:
+                print(f"❌ Failed to send message: {e}")
+                delivered = False
+            future.set_result(delivered)
+            with self._cond:
+                self._pending[key] -= 1
+                if not self._pending[key]:
+                    del self._pending[key]
+                self._cond.notify_all()
+        del self._queues[key]
+
+    async def _deliver(self, payload, bucket: TokenBucket) -> bool:
+        error = None
+        for attempt in range(MAX_RETRIES + 1):
+            await bucket.acquire()
+            await self._global_bucket.acquire()
+            try:
+                response = await self._client.post("/sendMessage", data=payload)
+            except httpx.HTTPError as e:
+                error = repr(e)
+            else:
+                if response.status_code == 200:
+                    print(f"✅ Message sent to chat {payload['chat_id']}")
+                    return True
+                error = response.text
+                if response.status_code == 429:
+                    wait = _retry_after(response)
+                    print(f"[WARN] Telegram rate limit for chat {payload['chat_id']}, retrying in {wait:.0f}s")
+                    bucket.block(wait + random.uniform(0, 1))
+                    continue
+                if response.status_code < 500:
+                    print(f"❌ Failed to send message: {error}")
+                    return False
+            await asyncio.sleep(_backoff(attempt))
+        print(f"❌ Failed to send message after {MAX_RETRIES + 1} attempts: {error}")
+        return False
+
+
+_outbound = OutboundQueue()
+
+
+def send_message(chat_id, message, parse_mode="HTML"):
+    """Queue a message for delivery; see OutboundQueue.send."""
+    return _outbound.send(chat_id, message, parse_mode)
+
+
+def flush(chat_id=None, timeout=None) -> bool:
+    return _outbound.flush(chat_id, timeout)
+
+
+# Scripts exit right after queueing; give the sender a chance to finish
+atexit.register(lambda: _outbound._loop is not None and _outbound.flush(timeout=EXIT_FLUSH_TIMEOUT))
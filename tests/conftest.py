@@ -0,0 +1,10 @@
+# tests/conftest.py
+#
+# Run from the project root: python -m pytest tests
+
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
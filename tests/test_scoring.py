@@ -0,0 +1,63 @@
+# tests/test_scoring.py
+#
+# score_signals must reproduce predict_stock_signal / generate_verdict exactly,
+# including missing values and the ADX rounding generate_report applies.
+
+import itertools
+import math
+
+import pandas as pd
+
+from modules.reports.generate_stock_report import extract_float, generate_verdict, predict_stock_signal
+from modules.reports.scoring import score_signals
+
+NAN = float("nan")
+
+RSI = [None, NAN, 25.0, 30.0, 50.0, 70.0, 75.0]
+MACD = [(None, 1.0), (1.0, None), (NAN, 1.0), (1.0, 1.0), (2.0, 1.0), (1.0, 2.0)]
+SUPERTREND = [True, False, None]
+# Values either side of the 20/40 thresholds after rounding to 2 decimals
+ADX = [None, NAN, 15.0, 20.0, 20.004, 20.006, 39.995, 40.0, 40.004, 40.006, 45.0]
+BANDS = [(None, 90.0, 100.0), (NAN, 90.0, 100.0), (110.0, 90.0, 100.0), (110.0, 90.0, 85.0),
+         (110.0, 90.0, 115.0), (110.0, 90.0, 90.0), (110.0, 90.0, 110.0)]
+
+
+def _grid():
+    for rsi, (macd, macd_signal), st, adx, (bb_upper, bb_lower, close) in itertools.product(
+            RSI, MACD, SUPERTREND, ADX, BANDS):
+        yield {"rsi_14": rsi, "macd": macd, "macd_signal": macd_signal, "supertrend_7_dir": st,
+               "adx_14": adx, "bb_upper": bb_upper, "bb_lower": bb_lower, "close": close}
+
+
+def _scalar(row):
+    # Same argument preparation as render_report
+    none_if_nan = lambda v: None if v is None or (isinstance(v, float) and math.isnan(v)) else v
+    kwargs = dict(
+        rsi=none_if_nan(row["rsi_14"]), macd=none_if_nan(row["macd"]), macd_signal=none_if_nan(row["macd_signal"]),
+        adx=extract_float(row, "adx_14"), atr=None, bb_upper=none_if_nan(row["bb_upper"]),
+        bb_lower=none_if_nan(row["bb_lower"]), close=none_if_nan(row["close"]),
+    )
+    signal, _ = predict_stock_signal(supertrend_dir=row["supertrend_7_dir"], **kwargs)
+    verdict = generate_verdict(supertrend=row["supertrend_7_dir"], **kwargs)
+    return signal, verdict
+
+
+def test_score_signals_matches_scalar_rules():
+    rows = list(_grid())
+    scored = score_signals(pd.DataFrame(rows, dtype=object))
+
+    mismatches = []
+    for row, signal, verdict in zip(rows, scored["signal"], scored["verdict"]):
+        expected = _scalar(row)
+        if (signal, verdict) != expected:
+            mismatches.append((row, (signal, verdict), expected))
+    assert not mismatches, f"{len(mismatches)} of {len(rows)} differ, e.g. {mismatches[0]}"
+
+
+def test_supertrend_strings_and_ints_parse_like_generate_report():
+    df = pd.DataFrame({"rsi_14": [50.0] * 4, "macd": [2.0] * 4, "macd_signal": [1.0] * 4, "adx_14": [25.0] * 4,
+                       "supertrend_7_dir": ["True", " false ", 1, 0.0]})
+    scored = score_signals(df)
+    # Floats are not a recognised direction, so the last row has no signal
+    assert scored["signal_score"].tolist()[:3] == [2.0, 0.0, 2.0]
+    assert math.isnan(scored["signal_score"].iloc[3])
@@ -0,0 +1,63 @@
+# tests/test_streaming.py
+#
+# StreamingIndicators must agree with the batch registry computation.
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules.indicators.registry import compute_indicator_arrays
+from modules.indicators.streaming import StreamingIndicators
+
+CONFIGS = [
+    None,
+    {"rsi_period": 9, "macd_fast": 8, "macd_slow": 21, "macd_signal": 5, "bb_window": 10, "bb_std": 2.5,
+     "atr_period": 10, "adx_period": 10, "supertrend_period": 10, "supertrend_multiplier": 2},
+]
+
+
+def _prices(n=600, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 1000 + np.cumsum(rng.normal(0, 5, n))
+    return pd.DataFrame({
+        "date": pd.bdate_range("2022-01-03", periods=n),
+        "high": close + rng.uniform(0, 10, n),
+        "low": close - rng.uniform(0, 10, n),
+        "close": close,
+    })
+
+
+def _assert_matches_batch(values, df, config):
+    batch = compute_indicator_arrays(df["high"].to_numpy(), df["low"].to_numpy(), df["close"].to_numpy(), config)
+    assert set(values) == set(batch)
+    for name, expected in batch.items():
+        last = np.asarray(expected)[-1]
+        if name.endswith("_dir"):
+            assert bool(values[name]) == bool(last), name
+        else:
+            assert values[name] == pytest.approx(float(last), rel=1e-9, abs=1e-9, nan_ok=True), name
+
+
+@pytest.mark.parametrize("config", CONFIGS)
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_seeded_last_bar_matches_batch(config, seed):
+    df = _prices(seed=seed)
+    engine = StreamingIndicators.seed(df, config)
+    _assert_matches_batch(engine.last_values, df, config)
+
+
+@pytest.mark.parametrize("config", CONFIGS)
+def test_incremental_updates_and_revised_bar_match_batch(config, tmp_path):
+    df = _prices(seed=3)
+    engine = StreamingIndicators.seed(df.iloc[:400], config)
+    for bar in df.iloc[400:-1].to_dict("records"):
+        engine.update(bar)
+
+    # A forming bar revised twice, with a save/load in between, ends up as if seen once
+    last = df.iloc[-1].to_dict()
+    engine.update({**last, "close": last["close"] * 1.03, "high": last["high"] * 1.03})
+    path = str(tmp_path / "state.json")
+    engine.save(path)
+    engine = StreamingIndicators.load(path)
+    values = engine.update(last)
+    _assert_matches_batch(values, df, config)
@@ -0,0 +1,42 @@
+# tests/test_symbol_resolver.py
+
+import pandas as pd
+import pytest
+
+from modules.utils.symbol_resolver import PREFIX, TOKEN, SymbolResolver
+
+COMPANIES = [
+    ("TATASTEEL", "Tata Steel Limited"),
+    ("TATAMOTORS", "Tata Motors Limited"),
+    ("JSWSTEEL", "JSW Steel Limited"),
+    ("HDFCBANK", "HDFC Bank Limited"),
+    ("INFY", "Infosys Limited"),
+]
+
+
+@pytest.fixture
+def resolver(tmp_path):
+    path = tmp_path / "listed_companies.csv"
+    pd.DataFrame(COMPANIES, columns=["symbol", "name"]).to_csv(path, index=False)
+    return SymbolResolver(str(path))
+
+
+def test_single_word_matches_later_name_token(resolver):
+    results = resolver.search("steel", limit=5)
+    assert {symbol for symbol, _, _ in results[:2]} == {"TATASTEEL", "JSWSTEEL"}
+    assert all(score == TOKEN for _, _, score in results[:2])
+
+
+def test_single_word_token_prefix(resolver):
+    assert resolver.resolve("motor") == "TATAMOTORS"
+    assert resolver.resolve("bank") == "HDFCBANK"
+
+
+def test_multi_word_tokens_intersect(resolver):
+    assert resolver.search("tata st", limit=1)[0][0] == "TATASTEEL"
+
+
+def test_name_prefix_outranks_token_match(resolver):
+    results = resolver.search("tata", limit=5)
+    assert results[0][2] >= PREFIX - 0.05
+    assert {symbol for symbol, _, _ in results[:2]} == {"TATASTEEL", "TATAMOTORS"}